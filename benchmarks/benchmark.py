@@ -18,12 +18,22 @@ Several features appear in two variants:
 Non-blocking operations (try_get, try_put, try_acquire) have no await at all; their for
 loops run entirely within a single coroutine send() call, so the benchmark captures raw
 method-call overhead with no scheduler involvement.
+
+measure_memory() runs each benchmark again under tracemalloc and reports the peak
+memory traced during the run, divided by the number of executions.  For benchmarks that
+create one process per execution this approximates the memory held per live process and
+its events; for single-process loops it reflects the short-lived objects of one step.
 """
 
 import argparse
 import csv
+import itertools
+import logging
+from operator import attrgetter
+import random
 import sys
 import time
+import tracemalloc
 import polars as pl
 from prettytable import PrettyTable, TableStyle
 
@@ -31,10 +41,12 @@ from asimpy import __version__ as asimpy_version
 from asimpy import (
     AllOf,
     Barrier,
+    ColumnarSink,
     Container,
     Environment,
     Event,
     FirstOf,
+    FluidContainer,
     Interrupt,
     PreemptiveResource,
     PriorityQueue,
@@ -72,6 +84,17 @@ def count_instructions(func, *args, **kwargs):
     return total[0]
 
 
+def measure_memory(func, *args, **kwargs):
+    """Return the peak number of bytes traced by tracemalloc while func runs."""
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
 def bench_timeout(num):
     """num Timeout events awaited in a single process."""
     class Proc(Process):
@@ -84,6 +107,18 @@ def bench_timeout(num):
     env.run()
 
 
+def bench_sleep(num):
+    """num Sleeps awaited in a single process."""
+    class Proc(Process):
+        async def run(self):
+            for _ in range(num):
+                await self.sleep(1)
+
+    env = Environment()
+    Proc(env)
+    env.run()
+
+
 def bench_event(num):
     """num manual Events created, scheduled, and awaited."""
     class Proc(Process):
@@ -110,6 +145,32 @@ def bench_process(num):
     env.run()
 
 
+def bench_task(num):
+    """num function-based processes each performing one Timeout."""
+    async def worker(env):
+        await env.timeout(1)
+
+    env = Environment()
+    for _ in range(num):
+        env.process(worker(env))
+    env.run()
+
+
+def bench_task_join(num):
+    """num Tasks each awaiting a child Task that performs one Timeout."""
+    async def child(env):
+        await env.timeout(1)
+        return 1
+
+    async def parent(env):
+        await env.process(child(env))
+
+    env = Environment()
+    for _ in range(num):
+        env.process(parent(env))
+    env.run()
+
+
 def bench_resource_uncontended(num):
     """num uncontended acquire/release cycles on a Resource."""
     class Proc(Process):
@@ -126,7 +187,7 @@ def bench_resource_uncontended(num):
     env.run()
 
 
-def bench_resource_contention(num):
+def bench_resource_contention(num, monitor=False, waits=False):
     """num processes each queuing for and releasing one Resource slot."""
     class Proc(Process):
         def init(self, res):
@@ -138,12 +199,22 @@ def bench_resource_contention(num):
             self.res.release()
 
     env = Environment()
-    res = Resource(env)
+    res = Resource(env, monitor=monitor, waits=waits)
     for _ in range(num):
         Proc(env, res)
     env.run()
 
 
+def bench_resource_monitored(num):
+    """bench_resource_contention with monitor=True on the Resource."""
+    bench_resource_contention(num, monitor=True)
+
+
+def bench_resource_waits(num):
+    """bench_resource_contention with waits=True on the Resource."""
+    bench_resource_contention(num, waits=True)
+
+
 def bench_preemptive(num):
     """num preemptions of a low-priority process by a high-priority one."""
     interrupted = [0]
@@ -215,7 +286,7 @@ def bench_store(num):
     env.run()
 
 
-def bench_queue(num):
+def bench_queue(num, monitor=False):
     """num put/get pairs on a Queue."""
     class Proc(Process):
         def init(self, q):
@@ -229,10 +300,15 @@ def bench_queue(num):
     env = Environment()
     # capacity=num: queue never fills, so put never blocks; get always follows put,
     # so get never blocks either.  See bench_queue_blocking_put/get for the blocked paths.
-    Proc(env, Queue(env, capacity=num))
+    Proc(env, Queue(env, capacity=num, monitor=monitor))
     env.run()
 
 
+def bench_queue_monitored(num):
+    """bench_queue with monitor=True on the Queue."""
+    bench_queue(num, monitor=True)
+
+
 def bench_priority_queue(num):
     """num put/get pairs on a PriorityQueue."""
     class Proc(Process):
@@ -246,12 +322,69 @@ def bench_priority_queue(num):
 
     env = Environment()
     # capacity=num: same reasoning as bench_queue; neither put nor get blocks.
-    # Items are inserted in ascending order (i increases each iteration), so bisect.insort
-    # always appends, giving best-case insertion cost for the sorted structure.
+    # Items are inserted in ascending order (i increases each iteration), so
+    # each heap push lands at the bottom without sifting: the best case.
     Proc(env, PriorityQueue(env, capacity=num))
     env.run()
 
 
+class _Job:
+    """Payload for the prioritized PriorityQueue benchmarks."""
+    __slots__ = ("priority",)
+
+    def __init__(self, priority):
+        self.priority = priority
+
+
+# Number of jobs waiting in the prioritized PriorityQueue benchmarks.
+_BACKLOG = 100
+
+
+def _bench_prioritized(num, make_queue, put):
+    """num get/put pairs on a queue holding _BACKLOG jobs with random priorities."""
+    rng = random.Random(0)
+    env = Environment()
+    pq = make_queue(env)
+    for _ in range(_BACKLOG):
+        put(pq, _Job(rng.randrange(10)))
+
+    async def worker():
+        for _ in range(num):
+            await pq.get()
+            await put(pq, _Job(rng.randrange(10)))
+
+    env.process(worker())
+    env.run()
+
+
+def bench_priority_queue_tuples(num):
+    """Prioritized jobs wrapped in (priority, counter, job) tuples."""
+    counter = itertools.count()
+    _bench_prioritized(
+        num,
+        PriorityQueue,
+        lambda pq, job: pq.put((job.priority, next(counter), job)),
+    )
+
+
+def bench_priority_queue_priority(num):
+    """Prioritized jobs passed with put(job, priority=...)."""
+    _bench_prioritized(
+        num,
+        PriorityQueue,
+        lambda pq, job: pq.put(job, priority=job.priority),
+    )
+
+
+def bench_priority_queue_key(num):
+    """Prioritized jobs ordered by a key= function."""
+    _bench_prioritized(
+        num,
+        lambda env: PriorityQueue(env, key=attrgetter("priority")),
+        lambda pq, job: pq.put(job),
+    )
+
+
 def bench_barrier(num):
     """num barrier wait/release cycles (one waiter, one releaser)."""
     class Waiter(Process):
@@ -343,18 +476,33 @@ def bench_interrupt(num):
     env.run()
 
 
-def bench_log(num):
-    """num calls to Environment.log."""
+def bench_log(num, log_level=logging.NOTSET, sink=None):
+    """num calls to Environment.log with a lazily formatted message."""
     class Proc(Process):
         async def run(self):
-            for _ in range(num):
-                self._env.log("bench", "message")
+            for i in range(num):
+                self._env.log("bench", "message %d", i, level=logging.DEBUG)
 
-    env = Environment()
+    env = Environment(log_level=log_level, sink=sink)
     Proc(env)
     env.run()
 
 
+def bench_log_columnar(num):
+    """bench_log recording into a ColumnarSink."""
+    bench_log(num, sink=ColumnarSink())
+
+
+def bench_log_filtered(num):
+    """bench_log with DEBUG messages filtered out by log_level=INFO."""
+    bench_log(num, log_level=logging.INFO)
+
+
+def bench_log_disabled(num):
+    """bench_log with logging turned off (log_level=None)."""
+    bench_log(num, log_level=None)
+
+
 # Slot count for the multi-capacity Resource benchmark.
 MULTI_CAPACITY = 4
 
@@ -512,6 +660,43 @@ def bench_container_float(num):
     env.run()
 
 
+# Pump increments per unit drawn in the Container (pump loop) benchmark.
+PUMP_STEPS = 10
+
+
+def bench_container_pump(num):
+    """num blocking gets of 1 unit fed by a pump process adding small increments."""
+    env = Environment()
+    tank = Container(env)
+
+    async def pump():
+        for _ in range(num * PUMP_STEPS):
+            await env.timeout(1 / PUMP_STEPS)
+            await tank.put(1 / PUMP_STEPS)
+
+    async def consumer():
+        for _ in range(num):
+            await tank.get(1)
+
+    env.process(pump())
+    env.process(consumer())
+    env.run()
+
+
+def bench_fluid_container(num):
+    """num blocking gets of 1 unit fed by a continuous inflow (same model as above)."""
+    env = Environment()
+    tank = FluidContainer(env)
+    tank.flow(1)
+
+    async def consumer():
+        for _ in range(num):
+            await tank.get(1)
+
+    env.process(consumer())
+    env.run()
+
+
 def bench_resource_try_acquire(num):
     """num try_acquire/release cycles on a Resource (non-blocking acquire)."""
     class Proc(Process):
@@ -600,6 +785,60 @@ def bench_preemptive_no_preempt(num):
     env.run()
 
 
+def bench_preemptive_token(num):
+    """num uncontended PreemptiveResource acquires, each released by token."""
+    async def user(env, res):
+        for _ in range(num):
+            token = await res.acquire()
+            res.release(token)
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(user(env, res))
+    env.run()
+
+
+def _preempting_jobs(env, res, num):
+    """Process that preempts the resource num times for one tick each."""
+    async def high():
+        for _ in range(num):
+            await env.timeout(2)
+            token = await res.acquire(priority=0)
+            await env.timeout(1)
+            res.release(token)
+
+    env.process(high())
+
+
+def bench_preemptive_resume(num):
+    """num preemptions of a long job that tracks its remaining work by hand."""
+    async def low(env, res):
+        remaining = 3 * num
+        while remaining > 0:
+            token = await res.acquire(priority=10)
+            try:
+                await env.timeout(remaining)
+                res.release(token)
+                remaining = 0
+            except Interrupt as exc:
+                remaining -= env.now - exc.cause.usage_since
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(low(env, res))
+    _preempting_jobs(env, res, num)
+    env.run()
+
+
+def bench_preemptive_serve(num):
+    """num preemptions of a long job submitted with serve()."""
+    env = Environment()
+    res = PreemptiveResource(env)
+    res.serve(3 * num, priority=10)
+    _preempting_jobs(env, res, num)
+    env.run()
+
+
 def bench_preempted_cause(num):
     """num preemptions where the victim reads Preempted.by and .usage_since."""
     interrupted = [0]
@@ -795,33 +1034,50 @@ BENCHMARKS = [
     ("Container",                           bench_container),
     ("Container (float amounts)",           bench_container_float),
     ("Container (non-blocking)",            bench_container_nonblocking),
+    ("Container (pump loop)",               bench_container_pump),
     ("Environment.get_log",                 bench_get_log),
     ("Environment.log",                     bench_log),
+    ("Environment.log (columnar)",          bench_log_columnar),
+    ("Environment.log (disabled)",          bench_log_disabled),
+    ("Environment.log (filtered)",          bench_log_filtered),
     ("Environment.run(until=)",             bench_run_until),
     ("Event",                               bench_event),
     ("Event (cancel)",                      bench_event_cancel),
     ("Event (fail)",                        bench_event_fail),
     ("FirstOf",                             bench_firstof),
     ("FirstOf (blocking)",                  bench_firstof_async),
+    ("FluidContainer",                      bench_fluid_container),
     ("Interrupt",                           bench_interrupt),
     ("Interrupt (with cause)",              bench_interrupt_with_cause),
     ("PreemptiveResource",                  bench_preemptive),
     ("PreemptiveResource (cause fields)",   bench_preempted_cause),
     ("PreemptiveResource (no-preempt)",     bench_preemptive_no_preempt),
+    ("PreemptiveResource (resume by hand)", bench_preemptive_resume),
+    ("PreemptiveResource (serve)",          bench_preemptive_serve),
+    ("PreemptiveResource (token)",          bench_preemptive_token),
     ("PriorityQueue",                       bench_priority_queue),
+    ("PriorityQueue (key=)",                bench_priority_queue_key),
+    ("PriorityQueue (priority=)",           bench_priority_queue_priority),
+    ("PriorityQueue (tuple items)",         bench_priority_queue_tuples),
     ("Process",                             bench_process),
     ("Queue",                               bench_queue),
     ("Queue (blocking get)",                bench_queue_blocking_get),
     ("Queue (blocking put)",                bench_queue_blocking_put),
+    ("Queue (monitored)",                   bench_queue_monitored),
     ("Queue (non-blocking)",                bench_queue_nonblocking),
     ("Resource (contention)",               bench_resource_contention),
     ("Resource (context manager)",          bench_resource_context_manager),
+    ("Resource (monitored)",                bench_resource_monitored),
     ("Resource (multi-capacity)",           bench_resource_multi_capacity),
     ("Resource (try_acquire)",              bench_resource_try_acquire),
     ("Resource (uncontended)",              bench_resource_uncontended),
+    ("Resource (waits tallied)",            bench_resource_waits),
+    ("Sleep",                               bench_sleep),
     ("Store",                               bench_store),
     ("Store (filtered get)",                bench_store_filtered_get),
     ("Store (non-blocking)",                bench_store_nonblocking),
+    ("Task",                                bench_task),
+    ("Task (join)",                         bench_task_join),
     ("Timeout",                             bench_timeout),
 ]
 
@@ -829,18 +1085,20 @@ BENCHMARKS = [
 def benchmark():
     """Run all benchmarks and return results as a Polars DataFrame."""
     features, executions, instructions, instr_per_exec = [], [], [], []
-    elapsed_s_col, sec_per_exec = [], []
+    elapsed_s_col, sec_per_exec, bytes_per_exec = [], [], []
     for name, func in BENCHMARKS:
         t0 = time.perf_counter()
         func(NUM)
         elapsed = time.perf_counter() - t0
         count = count_instructions(func, NUM)
+        peak = measure_memory(func, NUM)
         features.append(name)
         executions.append(NUM)
         instructions.append(count)
         instr_per_exec.append(count / NUM)
         elapsed_s_col.append(elapsed * 1e6)
         sec_per_exec.append(elapsed / NUM * 1e6)
+        bytes_per_exec.append(peak / NUM)
     return pl.DataFrame({
         "feature": features,
         "executions": executions,
@@ -848,6 +1106,7 @@ def benchmark():
         "instr_per_execution": instr_per_exec,
         "elapsed_usec": elapsed_s_col,
         "usec_per_execution": sec_per_exec,
+        "bytes_per_execution": bytes_per_exec,
     })
 
 
@@ -885,23 +1144,24 @@ def main():
             print(f"# asimpy version {asimpy_version}\n", file=out)
         if args.format == "csv":
             writer = csv.writer(out)
-            writer.writerow(["feature", "executions", "instructions", "instr_per_execution", "elapsed_usec", "usec_per_execution"])
+            writer.writerow(["feature", "executions", "instructions", "instr_per_execution", "elapsed_usec", "usec_per_execution", "bytes_per_execution"])
             for row in df.iter_rows():
-                feature, execs, instr, rate, elapsed, usec = row
-                writer.writerow([feature, execs, instr, f"{rate:.1f}", f"{elapsed:.3f}", f"{usec:.3f}"])
+                feature, execs, instr, rate, elapsed, usec, nbytes = row
+                writer.writerow([feature, execs, instr, f"{rate:.1f}", f"{elapsed:.3f}", f"{usec:.3f}", f"{nbytes:.1f}"])
         else:
             table = PrettyTable()
             table.set_style(TableStyle.MARKDOWN)
-            table.field_names = ["feature", "executions", "instructions", "instr_per_execution", "elapsed_usec", "usec_per_execution"]
+            table.field_names = ["feature", "executions", "instructions", "instr_per_execution", "elapsed_usec", "usec_per_execution", "bytes_per_execution"]
             table.align["feature"] = "l"
             table.align["executions"] = "r"
             table.align["instructions"] = "r"
             table.align["instr_per_execution"] = "r"
             table.align["elapsed_usec"] = "r"
             table.align["usec_per_execution"] = "r"
+            table.align["bytes_per_execution"] = "r"
             for row in df.iter_rows():
-                feature, execs, instr, rate, elapsed, usec = row
-                table.add_row([feature, execs, instr, f"{rate:.1f}", f"{elapsed:.3f}", f"{usec:.3f}"])
+                feature, execs, instr, rate, elapsed, usec, nbytes = row
+                table.add_row([feature, execs, instr, f"{rate:.1f}", f"{elapsed:.3f}", f"{usec:.3f}", f"{nbytes:.1f}"])
             print(table, file=out)
     finally:
         if args.output:
@@ -0,0 +1,337 @@
+"""Benchmark how asimpy primitives scale with the number of waiting processes.
+
+benchmark.py measures the cost of one operation on a small model.  This
+script instead builds a model with `size` processes queued on a single
+primitive and reports the wall-clock time per process as `size` grows from
+10 to 100,000.  A primitive whose operations are O(log n) or better shows a
+roughly flat row; one with O(n) operations shows a row that grows tenfold
+with each tenfold increase in size.
+
+Each scenario is a function that takes `size` and returns the seconds spent
+running the model.  Processes are created, and queues filled, before the
+clock starts.
+"""
+
+import argparse
+import csv
+from operator import itemgetter
+import random
+import sys
+import time
+import polars as pl
+from prettytable import PrettyTable, TableStyle
+
+from asimpy import __version__ as asimpy_version
+from asimpy import (
+    Container,
+    Environment,
+    FirstOf,
+    Interrupt,
+    KeyedStore,
+    PreemptiveResource,
+    PriorityQueue,
+    Queue,
+    Store,
+)
+
+# Seed for random priorities so that every run sees the same workload.
+SEED = 12345
+
+# Number of distinct priority levels used by prioritized scenarios.
+PRIORITIES = 10
+
+# Fraction of getters in the impatient scenarios that give up.
+IMPATIENT = 0.9
+
+
+def _run(env):
+    """Return seconds taken by env.run()."""
+    t0 = time.perf_counter()
+    env.run()
+    return time.perf_counter() - t0
+
+
+def scale_preemptive_waiters(size):
+    """size jobs with random priorities queue for a PreemptiveResource of capacity 1."""
+    rng = random.Random(SEED)
+    env = Environment()
+    res = PreemptiveResource(env)
+
+    async def job(priority):
+        await res.acquire(priority=priority, preempt=False)
+        await env.timeout(1)
+        res.release()
+
+    for _ in range(size):
+        env.process(job(rng.randrange(PRIORITIES)))
+    return _run(env)
+
+
+def scale_preemptive_preempt(size):
+    """size jobs arrive in worsening-then-improving priority order and preempt."""
+    env = Environment()
+    res = PreemptiveResource(env, capacity=max(1, size // 10))
+
+    async def job(priority, arrival):
+        await env.timeout(arrival)
+        while True:
+            try:
+                await res.acquire(priority=priority)
+                await env.timeout(size)
+                res.release()
+                return
+            except Interrupt:
+                # Preempted: queue again for the full amount of work.
+                pass
+
+    for i in range(size):
+        # Later arrivals have better priority, so each one preempts.
+        env.process(job(size - i, i / size))
+    return _run(env)
+
+
+def scale_priority_queue(size):
+    """size get/put pairs on a PriorityQueue that holds size items throughout."""
+    rng = random.Random(SEED)
+    env = Environment()
+    pq = PriorityQueue(env)
+    for _ in range(size):
+        pq.try_put(rng.random())
+
+    async def worker():
+        for _ in range(size):
+            item = await pq.get()
+            await pq.put(item + rng.random())
+
+    env.process(worker())
+    return _run(env)
+
+
+def _pickers(size, make_store, get):
+    """size pickers each wait for their own SKU; a supplier then stocks them."""
+    rng = random.Random(SEED)
+    env = Environment()
+    store = make_store(env)
+    skus = list(range(size))
+
+    async def picker(sku):
+        await get(store, sku)
+
+    async def supplier():
+        rng.shuffle(skus)
+        for sku in skus:
+            await store.put((sku, "widget"))
+
+    for sku in skus:
+        env.process(picker(sku))
+    env.process(supplier())
+    return _run(env)
+
+
+def scale_store_pickers(size):
+    """Pickers wait on Store.get(filter); each put calls every waiting filter."""
+    return _pickers(
+        size,
+        Store,
+        lambda store, sku: store.get(lambda item: item[0] == sku),
+    )
+
+
+def scale_keyed_store_pickers(size):
+    """Pickers wait on KeyedStore.get(sku); each put finds its picker directly."""
+    return _pickers(
+        size,
+        lambda env: KeyedStore(env, key=itemgetter(0)),
+        lambda store, sku: store.get(sku),
+    )
+
+
+def _impatient(size, make, get, put):
+    """size getters block at once; most give up via FirstOf timeouts.
+
+    The patient tenth wait indefinitely.  A supplier delivers one unit per
+    patient getter, spread over the same interval in which the impatient
+    ones time out, so every delivery lands among many cancelled waiters.
+    """
+    rng = random.Random(SEED)
+    env = Environment()
+    primitive = make(env)
+    patient = 0
+
+    async def getter(patience):
+        if patience is None:
+            await get(primitive)
+        else:
+            await FirstOf(env, got=get(primitive), late=env.timeout(patience))
+
+    async def supplier(count):
+        for _ in range(count):
+            await env.timeout(size / count)
+            await put(primitive)
+
+    for _ in range(size):
+        if rng.random() < IMPATIENT:
+            env.process(getter(rng.uniform(0, size)))
+        else:
+            patient += 1
+            env.process(getter(None))
+    env.process(supplier(patient))
+    return _run(env)
+
+
+def scale_queue_impatient(size):
+    """Queue getters mostly cancelled by FirstOf timeouts."""
+    return _impatient(size, Queue, Queue.get, lambda q: q.put("item"))
+
+
+def scale_store_impatient(size):
+    """Store getters mostly cancelled by FirstOf timeouts."""
+    return _impatient(size, Store, Store.get, lambda s: s.put("item"))
+
+
+def scale_container_impatient(size):
+    """Container getters mostly cancelled by FirstOf timeouts."""
+    return _impatient(size, Container, lambda c: c.get(1), lambda c: c.put(1))
+
+
+def _behind_large(size, **kwargs):
+    """Half the getters want more than will ever arrive; the rest want one unit.
+
+    The large requests are queued first, so a Container that scans its
+    blocked getters in arrival order re-examines all of them on every put.
+    """
+    env = Environment()
+    tank = Container(env, **kwargs)
+    small = size // 2
+
+    async def getter(amount):
+        await tank.get(amount)
+
+    async def supplier():
+        for _ in range(small):
+            await env.timeout(1)
+            await tank.put(1)
+
+    for _ in range(size - small):
+        env.process(getter(size))
+    for _ in range(small):
+        env.process(getter(1))
+    env.process(supplier())
+    return _run(env)
+
+
+def scale_container_first_fit(size):
+    """Unit gets queued behind unsatisfiable ones, served first-fit."""
+    return _behind_large(size)
+
+
+def scale_container_smallest_first(size):
+    """Unit gets queued behind unsatisfiable ones, served smallest-first."""
+    return _behind_large(size, policy="smallest_first")
+
+
+# (name, scenario, largest size to run or None for no limit)
+SCENARIOS = [
+    ("PreemptiveResource (waiters)", scale_preemptive_waiters, None),
+    ("PreemptiveResource (preempt)", scale_preemptive_preempt, None),
+    ("PriorityQueue (hold)", scale_priority_queue, None),
+    # Quadratic: 10^5 pickers would take hours.
+    ("Store (pickers by filter)", scale_store_pickers, 10**4),
+    ("KeyedStore (pickers by key)", scale_keyed_store_pickers, None),
+    ("Queue (impatient getters)", scale_queue_impatient, None),
+    ("Store (impatient getters)", scale_store_impatient, None),
+    ("Container (impatient getters)", scale_container_impatient, None),
+    ("Container (behind large, first_fit)", scale_container_first_fit, None),
+    (
+        "Container (behind large, smallest_first)",
+        scale_container_smallest_first,
+        None,
+    ),
+]
+
+
+def benchmark(max_size=10**5):
+    """Run every scenario at each size.
+
+    Returns a Polars DataFrame of usec per process.
+    """
+    sizes = [10**k for k in range(1, 6) if 10**k <= max_size]
+    rows = {"scenario": [name for name, _, _ in SCENARIOS]}
+    for size in sizes:
+        rows[f"usec_{size}"] = [
+            func(size) / size * 1e6 if limit is None or size <= limit else None
+            for _, func, limit in SCENARIOS
+        ]
+    return pl.DataFrame(rows)
+
+
+def _fmt(value):
+    """Format a timing, leaving sizes a scenario skipped blank."""
+    return "" if value is None else f"{value:.3f}"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark asimpy primitives as the number of waiters grows."
+    )
+    parser.add_argument(
+        "--format",
+        metavar="NAME",
+        choices=["csv", "markdown"],
+        default="markdown",
+        help="output format: csv or markdown (default: markdown)",
+    )
+    parser.add_argument(
+        "--max-size",
+        metavar="N",
+        type=int,
+        default=10**5,
+        help="largest number of processes to test (default: 100000)",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILENAME",
+        help="write results to this file (default: stdout)",
+    )
+    parser.add_argument(
+        "--version",
+        action="store_true",
+        help="show version header in output",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    df = benchmark(max_size=args.max_size)
+
+    newline = "" if args.format == "csv" else None
+    out = open(args.output, "w", newline=newline) if args.output else sys.stdout
+    try:
+        if args.version:
+            print(f"# asimpy version {asimpy_version}\n", file=out)
+        if args.format == "csv":
+            writer = csv.writer(out)
+            writer.writerow(df.columns)
+            for row in df.iter_rows():
+                name, *values = row
+                writer.writerow([name, *(_fmt(v) for v in values)])
+        else:
+            table = PrettyTable()
+            table.set_style(TableStyle.MARKDOWN)
+            table.field_names = df.columns
+            table.align["scenario"] = "l"
+            for name in df.columns[1:]:
+                table.align[name] = "r"
+            for row in df.iter_rows():
+                name, *values = row
+                table.add_row([name, *(_fmt(v) for v in values)])
+            print(table, file=out)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
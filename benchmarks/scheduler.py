@@ -0,0 +1,211 @@
+"""Benchmark asimpy schedulers with the classic "hold" model.
+
+Each run fills a scheduler with `size` pending entries whose times are spread
+by exponential gaps, then performs HOLDS hold operations: pop the earliest
+entry and push a replacement at that time plus another exponential delay.
+This keeps the number of pending entries constant at `size`, which is how a
+long-running model with many outstanding timeouts behaves.
+
+BucketScheduler only accepts integer times, so it is run on an integer
+workload in which each delay is an exponential delay scaled by TICKS and
+truncated; the heap is run on the same workload for comparison.
+
+Times are wall-clock rather than instruction counts: the point is to show how
+the cost per hold grows (or does not grow) with the number of pending entries.
+
+The *_ties_usec columns time a second workload: push `size` entries that
+all share one time, then pop them all.  Ties like this are the normal case
+in integer-time models, and they put every entry in a single calendar
+bucket, so they check that a bucket's cost does not grow with its size.
+
+The *_bytes columns report memory per pending entry, measured with tracemalloc
+while the scheduler is filled.  Every entry shares one callback function, so
+the figures cover the scheduler's own bookkeeping (tuple, boxed time, boxed
+serial, container slot) but not the bound-method callback a real model adds.
+Larger sizes take a long time and a lot of memory, so the default maximum is
+10^6; pass --max-size 10000000 to include 10^7.
+"""
+
+import argparse
+import csv
+from functools import partial
+import random
+import sys
+import time
+import tracemalloc
+import polars as pl
+from prettytable import PrettyTable, TableStyle
+
+from asimpy import __version__ as asimpy_version
+from asimpy import (
+    ArrayHeapScheduler,
+    BucketScheduler,
+    CalendarScheduler,
+    HeapScheduler,
+)
+
+# Number of hold operations timed at each size.
+HOLDS = 100_000
+
+# Seed for the random delays so that every scheduler sees the same workload.
+SEED = 12345
+
+# Mean delay (in ticks) of the integer workload.
+TICKS = 100
+
+# (column name, scheduler class, use integer workload)
+SCHEDULERS = [
+    ("heap", HeapScheduler, False),
+    ("array_heap", ArrayHeapScheduler, False),
+    ("calendar", CalendarScheduler, False),
+    ("heap_int", HeapScheduler, True),
+    ("bucket_int", BucketScheduler, True),
+]
+
+
+def _noop():
+    pass
+
+
+def _delays(integer):
+    """Return a function producing this workload's random delays."""
+    rng = random.Random(SEED)
+    if integer:
+        # Bind the scale as a default so the timed loop does no global lookups.
+        def delay(expo=rng.expovariate, ticks=TICKS):
+            return int(expo(1.0) * ticks)
+
+        return delay
+    return partial(rng.expovariate, 1.0)
+
+
+def _fill(sched, size, delay):
+    """Push `size` entries into `sched`; return the next unused serial."""
+    push = sched.push
+    for serial in range(size):
+        push(delay(), serial, _noop)
+    return size
+
+
+def hold(cls, size, holds, integer=False):
+    """Return seconds taken for `holds` hold operations on `size` pending entries."""
+    delay = _delays(integer)
+    sched = cls()
+    serial = _fill(sched, size, delay)
+
+    push, pop = sched.push, sched.pop
+    t0 = time.perf_counter()
+    for _ in range(holds):
+        now, _, cb = pop()
+        push(now + delay(), serial, cb)
+        serial += 1
+    return time.perf_counter() - t0
+
+
+def ties(cls, size):
+    """Return seconds per entry to push `size` entries at one time and pop them all."""
+    sched = cls()
+    push, pop = sched.push, sched.pop
+    t0 = time.perf_counter()
+    for serial in range(size):
+        push(0, serial, _noop)
+    while pop() is not None:
+        pass
+    return (time.perf_counter() - t0) / size
+
+
+def memory(cls, size, integer=False):
+    """Return bytes allocated per entry while filling a scheduler of `size` entries."""
+    delay = _delays(integer)
+    # Draw the delays first so the random numbers are not counted.
+    delays = [delay() for _ in range(size)]
+    tracemalloc.start()
+    try:
+        sched = cls()
+        _fill(sched, size, iter(delays).__next__)
+        used, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return used / size
+
+
+def benchmark(max_size=10**6, holds=HOLDS):
+    """Run the hold model for each scheduler and size; return a Polars DataFrame."""
+    sizes = [10**k for k in range(3, 8) if 10**k <= max_size]
+    rows = {"size": sizes}
+    for name, cls, integer in SCHEDULERS:
+        rows[f"{name}_usec"] = [
+            hold(cls, size, holds, integer) / holds * 1e6 for size in sizes
+        ]
+    for name, cls, integer in SCHEDULERS:
+        if not integer or name == "bucket_int":
+            rows[f"{name.removesuffix('_int')}_ties_usec"] = [
+                ties(cls, size) * 1e6 for size in sizes
+            ]
+    for name, cls, integer in SCHEDULERS:
+        rows[f"{name}_bytes"] = [memory(cls, size, integer) for size in sizes]
+    return pl.DataFrame(rows)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark asimpy schedulers.")
+    parser.add_argument(
+        "--format",
+        metavar="NAME",
+        choices=["csv", "markdown"],
+        default="markdown",
+        help="output format: csv or markdown (default: markdown)",
+    )
+    parser.add_argument(
+        "--max-size",
+        metavar="N",
+        type=int,
+        default=10**6,
+        help="largest number of pending entries to test (default: 1000000)",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILENAME",
+        help="write results to this file (default: stdout)",
+    )
+    parser.add_argument(
+        "--version",
+        action="store_true",
+        help="show version header in output",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    df = benchmark(max_size=args.max_size)
+
+    newline = "" if args.format == "csv" else None
+    out = open(args.output, "w", newline=newline) if args.output else sys.stdout
+    try:
+        if args.version:
+            print(f"# asimpy version {asimpy_version}\n", file=out)
+        if args.format == "csv":
+            writer = csv.writer(out)
+            writer.writerow(df.columns)
+            for row in df.iter_rows():
+                size, *values = row
+                writer.writerow([size, *(f"{v:.3f}" for v in values)])
+        else:
+            table = PrettyTable()
+            table.set_style(TableStyle.MARKDOWN)
+            table.field_names = df.columns
+            for name in df.columns:
+                table.align[name] = "r"
+            for row in df.iter_rows():
+                size, *values = row
+                table.add_row([size, *(f"{v:.3f}" for v in values)])
+            print(table, file=out)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
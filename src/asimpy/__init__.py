@@ -6,24 +6,56 @@ from .container import Container, ContainerEmpty, ContainerFull
 from .environment import Environment
 from .event import Event
 from .interrupt import Interrupt
-from .process import Process
+from .monitor import TimeWeighted
+from .process import Process, Task
 from .timeout import Timeout
 from .firstof import FirstOf
+from .fluid import Flow, FluidContainer
 from .queue import PriorityQueue, Queue, QueueEmpty, QueueFull
 from .preemptive import Preempted, PreemptiveResource
 from .resource import Resource
-from .store import Store, StoreEmpty, StoreFull
+from .sleep import Sleep
+from .tally import Tally
+from .scheduler import (
+    ArrayHeapScheduler,
+    BucketScheduler,
+    CalendarScheduler,
+    HeapScheduler,
+    Scheduler,
+)
+from .sink import (
+    CallbackSink,
+    ColumnarSink,
+    CSVSink,
+    ListSink,
+    NullSink,
+    RingSink,
+    Sink,
+)
+from .store import KeyedStore, Store, StoreEmpty, StoreFull
 
 __all__ = [
     "AllOf",
+    "ArrayHeapScheduler",
     "Barrier",
+    "BucketScheduler",
+    "CalendarScheduler",
+    "CallbackSink",
+    "ColumnarSink",
     "Container",
     "ContainerEmpty",
     "ContainerFull",
+    "CSVSink",
     "Environment",
     "Event",
     "FirstOf",
+    "Flow",
+    "FluidContainer",
+    "HeapScheduler",
     "Interrupt",
+    "KeyedStore",
+    "ListSink",
+    "NullSink",
     "Process",
     "Preempted",
     "PreemptiveResource",
@@ -32,9 +64,16 @@ __all__ = [
     "QueueEmpty",
     "QueueFull",
     "Resource",
+    "RingSink",
+    "Scheduler",
+    "Sink",
+    "Sleep",
     "Store",
     "StoreEmpty",
     "StoreFull",
+    "Tally",
+    "Task",
+    "TimeWeighted",
     "Timeout",
 ]
 
@@ -2,6 +2,7 @@
 
 from typing import Any
 from .event import Event
+from .process import _Driver
 
 
 class AllOf(Event):
@@ -24,9 +25,12 @@ class AllOf(Event):
         # _child_done checks len(_results) == len(_events); all events must be
         # present before any pre-triggered event fires during _add_waiter.
         for key, evt in events.items():
-            if not isinstance(evt, Event):
+            if isinstance(evt, _Driver):
+                evt = evt.join()
+            elif not isinstance(evt, Event):
                 raise TypeError(
-                    f"AllOf argument {key!r} must be an Event, got {type(evt).__name__}"
+                    f"AllOf argument {key!r} must be an Event or process, "
+                    f"got {type(evt).__name__}"
                 )
             self._events[key] = evt
 
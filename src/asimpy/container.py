@@ -1,10 +1,17 @@
 """Homogeneous resource (continuous or discrete amounts)."""
 
-from typing import Union
-from .event import _CANCELLED, Event
+from bisect import bisect_right, insort
+from collections import deque
+import itertools
+from typing import Any, Callable, Union
+from .event import _PENDING, Event, _Triggered
+from .monitor import TimeWeighted
 
 Amount = Union[int, float]
 
+# Orders in which a Container may serve blocked gets and puts.
+POLICIES = ("fifo", "first_fit", "smallest_first")
+
 
 class ContainerEmpty(Exception):
     """Raised by Container.try_get() when there is insufficient content."""
@@ -14,6 +21,130 @@ class ContainerFull(Exception):
     """Raised by Container.try_put() when there is insufficient space."""
 
 
+class _Pending:
+    """Blocked gets (or puts) of one Container, indexed for its policy.
+
+    "fifo" keeps one deque of (amount, Event) pairs in arrival order.  The
+    other policies keep a deque of (seq, Event) pairs per distinct amount
+    plus a sorted list of those amounts, so pop(available) uses bisect to
+    skip every bucket whose requests are too large and only looks at the
+    front of buckets that fit.
+
+    Cancelled requests stay where they are and are counted.  They are
+    dropped when they reach the front of their deque, and everything is
+    rebuilt once they outnumber live requests.  If `withdrawn` is given it
+    is called after each cancellation, so that the Container can serve
+    requests that were only waiting behind the cancelled one.
+    """
+
+    __slots__ = (
+        "_policy",
+        "_withdrawn",
+        "_queue",
+        "_buckets",
+        "_amounts",
+        "_seq",
+        "_live",
+        "_dead",
+    )
+
+    # Never rebuild with fewer cancelled requests than this.
+    _COMPACT_MIN = 64
+
+    def __init__(self, policy: str, withdrawn: Callable[[], None] | None = None):
+        self._policy = policy
+        self._withdrawn = withdrawn
+        self._queue: deque = deque()  # (amount, Event) pairs ("fifo" only)
+        self._buckets: dict = {}  # amount -> deque of (seq, Event) pairs
+        self._amounts: list = []  # keys of _buckets, ascending
+        self._seq = itertools.count()
+        self._live = 0
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def push(self, amount: Amount, evt: Event) -> None:
+        """Queue `evt`, a blocked request for `amount`."""
+        if self._policy == "fifo":
+            self._queue.append((amount, evt))
+        else:
+            bucket = self._buckets.get(amount)
+            if bucket is None:
+                bucket = self._buckets[amount] = deque()
+                insort(self._amounts, amount)
+            bucket.append((next(self._seq), evt))
+        self._live += 1
+        evt._on_cancel = self._cancelled
+
+    def pop(self, available: Amount) -> tuple | None:
+        """Remove and return the next (amount, Event) to serve, or None.
+
+        Only requests for at most `available` can be served.  "fifo" serves
+        the oldest request or nothing, "first_fit" the oldest request that
+        fits, and "smallest_first" the oldest of the smallest requests.
+        """
+        if not self._live:
+            return None
+        if self._policy == "fifo":
+            queue = self._queue
+            while queue[0][1]._value is not _PENDING:
+                queue.popleft()
+                self._dead -= 1
+            if queue[0][0] > available:
+                return None
+            self._live -= 1
+            return queue.popleft()
+
+        amounts = self._amounts
+        buckets = self._buckets
+        first_fit = self._policy == "first_fit"
+        end = bisect_right(amounts, available)
+        best = None
+        i = 0
+        while i < end:
+            bucket = buckets[amounts[i]]
+            while bucket and bucket[0][1]._value is not _PENDING:
+                bucket.popleft()
+                self._dead -= 1
+            if not bucket:
+                del buckets[amounts[i]]
+                del amounts[i]
+                end -= 1
+                continue
+            if best is None or bucket[0][0] < buckets[amounts[best]][0][0]:
+                best = i
+                if not first_fit:
+                    break
+            i += 1
+        if best is None:
+            return None
+        amount = amounts[best]
+        bucket = buckets[amount]
+        _, evt = bucket.popleft()
+        if not bucket:
+            del buckets[amount]
+            del amounts[best]
+        self._live -= 1
+        return amount, evt
+
+    def _cancelled(self, _value: Any) -> None:
+        """Count a request cancelled while blocked; rebuild if they dominate."""
+        self._live -= 1
+        self._dead += 1
+        if self._dead >= self._COMPACT_MIN and self._dead > self._live:
+            self._queue = deque(e for e in self._queue if e[1]._value is _PENDING)
+            for amount in self._amounts:
+                self._buckets[amount] = deque(
+                    e for e in self._buckets[amount] if e[1]._value is _PENDING
+                )
+            self._amounts = [a for a in self._amounts if self._buckets[a]]
+            self._buckets = {a: self._buckets[a] for a in self._amounts}
+            self._dead = 0
+        if self._withdrawn is not None:
+            self._withdrawn()
+
+
 class Container:
     """A resource holding up to *capacity* units of homogeneous content.
 
@@ -23,6 +154,26 @@ class Container:
 
     Cancelled get events restore the level via _on_cancel so that FirstOf
     does not silently discard consumed content.
+
+    `policy` decides which blocked requests are served when the level
+    changes; blocked puts are served by the same rule, with the free space
+    in place of the level:
+
+    - "first_fit" (default): the oldest request that fits, repeatedly, so
+      a small request can overtake a larger one that is still waiting.
+    - "fifo": strictly in arrival order; service stops at the first
+      request that does not fit, and new requests queue behind blocked
+      ones even if they would fit.  If the blocking request is cancelled,
+      the ones behind it are served at once.
+    - "smallest_first": the smallest request that fits, oldest first among
+      equal amounts.
+
+    Blocked requests are indexed by amount (see _Pending), so serving them
+    never re-examines a request that cannot be satisfied.
+
+    With monitor=True, `monitor` is a TimeWeighted that tracks `level`.
+    Its time_at_level() totals are only kept with levels=True, since a
+    float level rarely repeats and would add an entry per change.
     """
 
     def __init__(
@@ -30,6 +181,9 @@ class Container:
         env,
         capacity: Amount = float("inf"),
         init: Amount = 0,
+        policy: str = "first_fit",
+        monitor: bool = False,
+        levels: bool = False,
     ):
         if capacity <= 0:
             raise ValueError(f"capacity must be positive, got {capacity}")
@@ -37,12 +191,20 @@ class Container:
             raise ValueError(f"init must be non-negative, got {init}")
         if init > capacity:
             raise ValueError(f"init ({init}) must be <= capacity ({capacity})")
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}, got {policy!r}")
         self._env = env
         self._capacity = capacity
         self._level: Amount = init
-        # Each entry is [amount, Event].
-        self._getters: list = []
-        self._putters: list = []
+        self._policy = policy
+        # Under "fifo" a new request may not overtake blocked ones.
+        self._fifo = policy == "fifo"
+        # Only "fifo" lets a blocked request hold up the ones behind it, so
+        # only "fifo" needs to re-serve after a cancellation.
+        withdrawn = self._withdrawn if self._fifo else None
+        self._getters = _Pending(policy, withdrawn)
+        self._putters = _Pending(policy, withdrawn)
+        self._monitor = TimeWeighted(env, init, levels) if monitor else None
 
     @property
     def level(self) -> Amount:
@@ -54,6 +216,16 @@ class Container:
         """Maximum capacity."""
         return self._capacity
 
+    @property
+    def policy(self) -> str:
+        """Order in which blocked requests are served (one of POLICIES)."""
+        return self._policy
+
+    @property
+    def monitor(self) -> TimeWeighted | None:
+        """Time-weighted statistics of `level`, or None if not monitored."""
+        return self._monitor
+
     # ------------------------------------------------------------------
     # Blocking operations (return Event)
     # ------------------------------------------------------------------
@@ -67,31 +239,35 @@ class Container:
         """
         if amount <= 0:
             raise ValueError(f"amount must be positive, got {amount}")
-        if self._level >= amount:
+        if self._level >= amount and not (self._fifo and self._getters):
             self._level -= amount
             self._trigger_putters()
+            if self._monitor is not None:
+                self._monitor.record(self._level)
             evt = Event(self._env)
-            evt._on_cancel = lambda v: self._undo_get(v)
+            evt._on_cancel = self._undo_get
             evt.succeed(amount)
             return evt
 
         evt = Event(self._env)
-        self._getters.append([amount, evt])
+        self._getters.push(amount, evt)
         return evt
 
     def put(self, amount: Amount) -> Event:
         """Return an Event that resolves to *amount* when space is available."""
         if amount <= 0:
             raise ValueError(f"amount must be positive, got {amount}")
-        if self._level + amount <= self._capacity:
+        if self._level + amount <= self._capacity and not (
+            self._fifo and self._putters
+        ):
             self._level += amount
             self._trigger_getters()
-            evt = Event(self._env)
-            evt.succeed(amount)
-            return evt
+            if self._monitor is not None:
+                self._monitor.record(self._level)
+            return _Triggered(self._env, amount)
 
         evt = Event(self._env)
-        self._putters.append([amount, evt])
+        self._putters.push(amount, evt)
         return evt
 
     # ------------------------------------------------------------------
@@ -105,6 +281,8 @@ class Container:
         if self._level < amount:
             raise ContainerEmpty(f"requested {amount}, available {self._level}")
         self._level -= amount
+        if self._monitor is not None:
+            self._monitor.record(self._level)
         return amount
 
     def try_put(self, amount: Amount) -> None:
@@ -116,6 +294,8 @@ class Container:
                 f"adding {amount} would exceed capacity {self._capacity}"
             )
         self._level += amount
+        if self._monitor is not None:
+            self._monitor.record(self._level)
 
     # ------------------------------------------------------------------
     # Internal
@@ -123,37 +303,37 @@ class Container:
 
     def _trigger_getters(self) -> None:
         """Satisfy as many pending getters as the current level allows."""
-        i = 0
-        while i < len(self._getters):
-            amount, evt = self._getters[i]
-            if evt._value is _CANCELLED:
-                self._getters.pop(i)
-                continue
-            if self._level >= amount:
-                self._level -= amount
-                self._getters.pop(i)
-                # Set _on_cancel before succeed() so cancel() can restore
-                # the level even after the event has been triggered.
-                evt._on_cancel = lambda v: self._undo_get(v)
-                evt.succeed(amount)
-            else:
-                i += 1
+        if not self._getters._live:
+            return
+        pop = self._getters.pop
+        while (entry := pop(self._level)) is not None:
+            amount, evt = entry
+            self._level -= amount
+            # Set _on_cancel before succeed() so cancel() can restore
+            # the level even after the event has been triggered.
+            evt._on_cancel = self._undo_get
+            evt.succeed(amount)
 
     def _trigger_putters(self) -> None:
         """Satisfy as many pending putters as capacity allows."""
-        i = 0
-        while i < len(self._putters):
-            amount, evt = self._putters[i]
-            if evt._value is _CANCELLED:
-                self._putters.pop(i)
-                continue
-            if self._level + amount <= self._capacity:
-                self._level += amount
-                self._putters.pop(i)
-                evt.succeed(amount)
-            else:
-                i += 1
+        if not self._putters._live:
+            return
+        pop = self._putters.pop
+        while (entry := pop(self._capacity - self._level)) is not None:
+            amount, evt = entry
+            self._level += amount
+            evt._on_cancel = None
+            evt.succeed(amount)
+
+    def _withdrawn(self) -> None:
+        """A blocked request was cancelled: serve those that were behind it."""
+        self._trigger_getters()
+        self._trigger_putters()
+        if self._monitor is not None:
+            self._monitor.record(self._level)
 
     def _undo_get(self, amount: Amount) -> None:
         """Restore *amount* to the level after a get is cancelled."""
         self._level += amount
+        if self._monitor is not None:
+            self._monitor.record(self._level)
@@ -1,85 +1,216 @@
 """Discrete-event simulation environment."""
 
 from collections import deque
-import heapq
+from collections.abc import Callable, Coroutine
 import itertools
-from typing import TYPE_CHECKING
-
-from .event import Event
+import logging
+import math
+from typing import Any
+
+from .event import _CANCELLED, _Triggered
+from .process import Task, _Driver
+from .scheduler import HeapScheduler, Scheduler
+from .sink import ListSink, Record, Sink
+from .sleep import Sleep
 from .timeout import _NO_TIME, Timeout
 
-if TYPE_CHECKING:
-    from .process import Process
+# Placeholder argument in _ready for callbacks that take no argument.
+_NO_ARG = object()
+
 
-# Tiebreaker counter for heap entries at the same simulation time.
-_serial = itertools.count()
+def _is_dead(cb) -> bool:
+    """True if scheduler callback `cb` belongs to a cancelled Timeout or Sleep."""
+    func = getattr(cb, "__func__", None)
+    if func is Timeout._fire:
+        return cb.__self__._value is _CANCELLED
+    if func is Sleep._fire:
+        return cb.__self__._process is None
+    return False
 
 
 class Environment:
     """Discrete-event simulation environment.
 
     Maintains two queues:
-    - _ready: callbacks to run at the current simulated time (deque).
-    - _heap:  callbacks scheduled for a future time (min-heap).
-
-    The clock only advances when popping from _heap; _ready is always drained
-    first.  This prevents zero-delay events from racing ahead of same-time
-    future events and ensures FIFO ordering among simultaneous events.
+    - _ready:     (callback, argument) pairs to run at the current simulated
+                  time (deque); an argument of _NO_ARG means call the
+                  callback with no argument.
+    - _scheduler: callbacks scheduled for a future time (a Scheduler;
+                  a binary min-heap unless another one is passed in).
+
+    The clock only advances when popping from _scheduler; _ready is always
+    drained first.  This prevents zero-delay events from racing ahead of
+    same-time future events and ensures FIFO ordering among simultaneous
+    events.
+
+    A cancelled Timeout (e.g. the loser of a FirstOf race) or an interrupted
+    Sleep leaves a dead entry in _scheduler.  Dead entries are counted, and
+    once they make up more than `compact_fraction` of all scheduled entries
+    they are removed in one pass.
+
+    log() passes (now, name, message) records to a Sink.  The default
+    ListSink keeps them all; pass sink=RingSink(n), CSVSink(path),
+    NullSink() or CallbackSink(func) to keep logging memory bounded, or
+    ColumnarSink() to keep everything compactly for analysis.
+    Records whose level is below `log_level` are dropped before their
+    message is formatted; log_level=None turns logging off.
     """
 
-    def __init__(self):
+    # Never compact for fewer than this many dead entries.
+    _COMPACT_MIN = 64
+
+    def __init__(
+        self,
+        scheduler: Scheduler | None = None,
+        compact_fraction: float = 0.5,
+        sink: Sink | None = None,
+        log_level: int | None = logging.NOTSET,
+    ):
+        if not 0 < compact_fraction <= 1:
+            raise ValueError(
+                f"compact_fraction must be in (0, 1], got {compact_fraction}"
+            )
         self._now: float | int = 0
-        self._heap: list = []
+        self._scheduler: Scheduler = HeapScheduler() if scheduler is None else scheduler
+        self._compact_fraction = compact_fraction
+        self._dead = 0
+        # Tiebreaker for entries at the same simulation time.  It belongs to
+        # the environment so that tie-breaking does not depend on what other
+        # simulations have run in the same interpreter.
+        self._serial = itertools.count()
+        # Shared result of put() calls that succeed immediately.
+        self._put_done = _Triggered(self, True)
         self._ready: deque = deque()
-        self._active_process: "Process | None" = None
-        self._log: list[tuple[float | int, str, str]] = []
+        self._active_process: _Driver | None = None
+        self._sink: Sink = ListSink() if sink is None else sink
+        self._write = self._sink.write
+        self.log_level = log_level
 
     @property
     def now(self) -> float | int:
         """Current simulation time."""
         return self._now
 
-    def log(self, name: str, message: str) -> None:
-        """Record a log message."""
-        self._log.append((self._now, name, message))
+    @property
+    def live_count(self) -> int:
+        """Number of scheduled future entries that will still do something."""
+        return len(self._scheduler) - self._dead
 
-    def get_log(self) -> list[tuple[float | int, str, str]]:
-        return self._log
+    @property
+    def dead_count(self) -> int:
+        """Number of scheduled entries left behind by cancelled timeouts and sleeps."""
+        return self._dead
+
+    @property
+    def sink(self) -> Sink:
+        """Destination of log records."""
+        return self._sink
+
+    @property
+    def log_level(self) -> int | None:
+        """Lowest level that log() records, or None if logging is off."""
+        return None if self._log_level == math.inf else int(self._log_level)
+
+    @log_level.setter
+    def log_level(self, level: int | None) -> None:
+        # A float, so that infinity can stand for "off" in log()'s comparison.
+        self._log_level: float = math.inf if level is None else level
+
+    def log(
+        self,
+        name: str,
+        message: str | Callable[[], str],
+        *args: Any,
+        level: int = logging.INFO,
+    ) -> None:
+        """Record a log message at `level` (one of the logging module's levels).
+
+        The message is formatted only if `level` is enabled: a callable is
+        called with no arguments, and a string with `args` is formatted as
+        `message % args`, so
+
+            env.log("server", "served %s after %.2f", job, wait)
+
+        costs one comparison when the level is filtered out.
+        """
+        if level < self._log_level:
+            return
+        if isinstance(message, str):
+            text = message % args if args else message
+        else:
+            text = message()
+        self._write(self._now, name, text)
+
+    def get_log(self) -> list[Record]:
+        """Return the log records held in memory by the sink."""
+        return self._sink.records()
 
     def immediate(self, cb) -> None:
         """Schedule `cb` for execution at the current simulated time."""
-        self._ready.append(cb)
+        self._ready.append((cb, _NO_ARG))
 
     def schedule(self, time: float | int, cb) -> None:
         """Schedule `cb` to run at `time` in the future."""
-        heapq.heappush(self._heap, (time, next(_serial), cb))
+        self._scheduler.push(time, next(self._serial), cb)
 
     def timeout(self, delay: float | int) -> Timeout:
         """Return a Timeout event for `delay` time units."""
         return Timeout(self, delay)
 
+    def process(self, coro: Coroutine) -> Task:
+        """Start a Task that drives the bare coroutine `coro`."""
+        return Task(self, coro)
+
+    def sleep(self, delay: float | int) -> Sleep:
+        """Return a Sleep that suspends the awaiting process for `delay` time units.
+
+        A Sleep has a single waiter: create one per process, or use timeout()
+        when several processes wait for the same moment.
+        """
+        return Sleep(self, delay)
+
     def run(self, until: float | int | None = None) -> None:
         """Run the simulation.
 
         Runs until no events remain, or until simulated time reaches `until`.
         """
+        pop = self._scheduler.pop
+        ready = self._ready
+        popleft = ready.popleft
+        no_arg = _NO_ARG
         while True:
             # Drain all zero-delay work before advancing the clock.
-            while self._ready:
-                self._ready.popleft()()
-
-            if not self._heap:
-                break
-
-            next_time = self._heap[0][0]
-            if until is not None and next_time > until:
+            while ready:
+                cb, arg = popleft()
+                if arg is no_arg:
+                    cb()
+                else:
+                    cb(arg)
+
+            # None means no events remain or the next one is after `until`.
+            entry = pop(until)
+            if entry is None:
                 break
 
-            _, _, cb = heapq.heappop(self._heap)
-            result = cb()
-            # _NO_TIME signals a cancelled Timeout; do not advance the clock.
-            if result is not _NO_TIME and next_time > self._now:
+            # Advance the clock before the callback runs, since a Sleep's
+            # callback drives its process's coroutine directly.
+            next_time, _, cb = entry
+            prev = self._now
+            if next_time > prev:
                 self._now = next_time
+            if cb() is _NO_TIME:
+                # A cancelled Timeout or Sleep: undo the clock advance.
+                self._dead -= 1
+                self._now = prev
+
+    def _discard(self) -> None:
+        """Count one scheduled entry as dead, compacting if there are too many."""
+        self._dead += 1
+        if (
+            self._dead >= self._COMPACT_MIN
+            and self._dead > self._compact_fraction * len(self._scheduler)
+        ):
+            self._dead -= self._scheduler.compact(_is_dead)
 
     def __repr__(self) -> str:
         return f"Environment(now={self._now})"
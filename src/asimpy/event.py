@@ -1,6 +1,9 @@
 """Awaitable simulation event."""
 
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .environment import Environment
 
 # Sentinels stored in Event._value to represent lifecycle state.
 _PENDING = object()  # event has not yet been triggered or cancelled
@@ -20,6 +23,11 @@ class Event:
         any value: triggered with that value (including None)
         _CANCELLED: cancelled; _on_cancel was called if set
 
+    _waiters is None when nobody is waiting, the callback itself when there
+    is exactly one waiter (the usual case: the parked process), and a list
+    only once a second waiter registers.  This saves allocating a list for
+    almost every event.
+
     The _on_cancel callback is called by cancel() even when the event has
     already been triggered.  This lets resource-consuming get() methods
     restore their resource when FirstOf discards a non-winning event.
@@ -30,7 +38,7 @@ class Event:
     def __init__(self, env: "Environment"):
         self._env = env
         self._value: Any = _PENDING
-        self._waiters: list = []
+        self._waiters: Any = None
         self._on_cancel = None
 
     @property
@@ -49,9 +57,17 @@ class Event:
         if self._value is not _PENDING:
             return
         self._value = value
-        waiters, self._waiters = self._waiters, []
-        for cb in waiters:
-            cb(value)
+        waiters = self._waiters
+        if waiters is None:
+            return
+        # Drop the references: FirstOf/AllOf waiters point back at events
+        # that point at them, and leaving the cycle to the GC costs memory.
+        self._waiters = None
+        if type(waiters) is list:
+            for cb in waiters:
+                cb(value)
+        else:
+            waiters(value)
 
     def fail(self, exc: Exception) -> None:
         """Trigger the event with an exception.
@@ -74,7 +90,7 @@ class Event:
             return
         old_value = self._value
         self._value = _CANCELLED
-        self._waiters = []
+        self._waiters = None
         if self._on_cancel is not None:
             self._on_cancel(old_value)
 
@@ -86,7 +102,13 @@ class Event:
         """
         v = self._value
         if v is _PENDING:
-            self._waiters.append(cb)
+            waiters = self._waiters
+            if waiters is None:
+                self._waiters = cb
+            elif type(waiters) is list:
+                waiters.append(cb)
+            else:
+                self._waiters = [waiters, cb]
         elif v is not _CANCELLED:
             cb(v)
 
@@ -95,3 +117,26 @@ class Event:
         if isinstance(value, BaseException):
             raise value
         return value
+
+
+class _Triggered(Event):
+    """A pre-triggered Event with nothing to undo if cancelled.
+
+    Non-blocking fast paths such as Queue.put() return one of these instead
+    of creating an Event and calling succeed() on it.  cancel() is a no-op,
+    so a single instance per value can be shared by every caller: FirstOf
+    and AllOf may "cancel" it as a loser without affecting anyone else.
+    Fast paths that must restore something on cancel (e.g. Queue.get())
+    still create a fresh Event with _on_cancel set.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, env: "Environment", value: Any):
+        self._env = env
+        self._value = value
+        self._waiters = None
+        self._on_cancel = None
+
+    def cancel(self) -> None:
+        """Do nothing: there is nothing to undo, and the event may be shared."""
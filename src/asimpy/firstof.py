@@ -2,6 +2,7 @@
 
 from typing import Any
 from .event import Event
+from .process import _Driver
 
 
 class FirstOf(Event):
@@ -24,9 +25,12 @@ class FirstOf(Event):
         # A pre-triggered event fires immediately inside _add_waiter, so
         # _child_done must see the full _events dict to cancel all non-winners.
         for key, evt in events.items():
-            if not isinstance(evt, Event):
+            if isinstance(evt, _Driver):
+                evt = evt.join()
+            elif not isinstance(evt, Event):
                 raise TypeError(
-                    f"FirstOf argument {key!r} must be an Event, got {type(evt).__name__}"
+                    f"FirstOf argument {key!r} must be an Event or process, "
+                    f"got {type(evt).__name__}"
                 )
             self._events[key] = evt
 
@@ -0,0 +1,278 @@
+"""Container whose level changes continuously at set rates."""
+
+from collections import deque
+import heapq
+import itertools
+from typing import Union
+from .event import _CANCELLED, _PENDING, Event, _Triggered
+from .timeout import Timeout
+
+Amount = Union[int, float]
+
+
+class Flow:
+    """A continuous inflow (positive rate) or outflow (negative rate).
+
+    Created by FluidContainer.flow().  Assigning to `rate` changes the flow
+    from the current simulated time on; stop() sets it to zero.
+    """
+
+    __slots__ = ("_tank", "_rate")
+
+    def __init__(self, tank: "FluidContainer", rate: float):
+        self._tank = tank
+        self._rate = 0
+        self.rate = rate
+
+    @property
+    def rate(self) -> float:
+        """Units per time unit; positive fills the container, negative drains it."""
+        return self._rate
+
+    @rate.setter
+    def rate(self, rate: float) -> None:
+        tank = self._tank
+        tank._settle()
+        tank._rate += rate - self._rate
+        self._rate = rate
+        tank._update()
+
+    def stop(self) -> None:
+        """Set this flow's rate to zero."""
+        self.rate = 0
+
+
+class FluidContainer:
+    """A Container whose level also changes continuously through flows.
+
+    Producers and consumers attach Flow objects with flow(rate) and change
+    their rates as the model runs; the level between changes is linear in
+    time, so it is computed when asked for instead of being stepped:
+
+        tank = FluidContainer(env, capacity=100)
+        pump = tank.flow(2.5)       # fill at 2.5 units per time unit
+        await tank.when_at_least(80)
+        pump.rate = 0
+
+    The level never leaves [0, capacity]: a net inflow into a full
+    container, or a net outflow from an empty one, is cut off at the
+    boundary.
+
+    Discrete get() and put() work like Container(policy="fifo"): blocked
+    requests are served strictly oldest first, and a request that does
+    not fit holds up the ones behind it (Container itself defaults to
+    "first_fit").  when_at_least()/when_at_most() wait for the level to
+    cross a threshold.  After every change of level or rate the
+    container works out which pending request the flows will satisfy
+    first and schedules a single Timeout for that moment, so a model with
+    steady flows costs one event per request served instead of one per
+    small increment.
+    """
+
+    def __init__(
+        self,
+        env,
+        capacity: Amount = float("inf"),
+        init: Amount = 0,
+    ):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        if init < 0:
+            raise ValueError(f"init must be non-negative, got {init}")
+        if init > capacity:
+            raise ValueError(f"init ({init}) must be <= capacity ({capacity})")
+        self._env = env
+        self._capacity = capacity
+        # The level was _level at time _since and has changed at _rate since.
+        self._level: float = init
+        self._since = env.now
+        self._rate: float = 0
+        self._getters: deque = deque()  # (amount, Event) pairs
+        self._putters: deque = deque()  # (amount, Event) pairs
+        self._rising: list = []  # heap of (threshold, seq, Event)
+        self._falling: list = []  # heap of (-threshold, seq, Event)
+        self._seq = itertools.count()
+        # The Timeout for the next crossing, and the level it is for.
+        self._timer: Timeout | None = None
+        self._target: float = 0
+
+    @property
+    def level(self) -> float:
+        """Current content level."""
+        self._settle()
+        return self._level
+
+    @property
+    def capacity(self) -> Amount:
+        """Maximum capacity."""
+        return self._capacity
+
+    @property
+    def rate(self) -> float:
+        """Net rate of all flows (before clipping at empty or full)."""
+        return self._rate
+
+    def flow(self, rate: float = 0) -> Flow:
+        """Attach and return a new Flow with the given rate."""
+        return Flow(self, rate)
+
+    # ------------------------------------------------------------------
+    # Blocking operations (return Event)
+    # ------------------------------------------------------------------
+
+    def get(self, amount: Amount) -> Event:
+        """Return an Event that resolves to *amount* once it can be removed.
+
+        If enough content is available now (and no earlier get is
+        waiting), the Event is pre-triggered and _on_cancel is set to
+        restore the level if FirstOf later discards the result.
+        """
+        if amount <= 0:
+            raise ValueError(f"amount must be positive, got {amount}")
+        self._settle()
+        evt = Event(self._env)
+        if self._level >= amount and not self._getters:
+            self._level -= amount
+            evt._on_cancel = self._undo_get
+            evt.succeed(amount)
+        else:
+            evt._on_cancel = self._withdrawn
+            self._getters.append((amount, evt))
+        self._update()
+        return evt
+
+    def put(self, amount: Amount) -> Event:
+        """Return an Event that resolves to *amount* once it has been added."""
+        if amount <= 0:
+            raise ValueError(f"amount must be positive, got {amount}")
+        self._settle()
+        if self._level + amount <= self._capacity and not self._putters:
+            self._level += amount
+            self._update()
+            return _Triggered(self._env, amount)
+        evt = Event(self._env)
+        evt._on_cancel = self._withdrawn
+        self._putters.append((amount, evt))
+        self._update()
+        return evt
+
+    def when_at_least(self, threshold: Amount) -> Event:
+        """Return an Event that resolves to the level once it is >= threshold."""
+        self._settle()
+        if self._level >= threshold:
+            return _Triggered(self._env, self._level)
+        evt = Event(self._env)
+        heapq.heappush(self._rising, (threshold, next(self._seq), evt))
+        self._reschedule()
+        return evt
+
+    def when_at_most(self, threshold: Amount) -> Event:
+        """Return an Event that resolves to the level once it is <= threshold."""
+        self._settle()
+        if self._level <= threshold:
+            return _Triggered(self._env, self._level)
+        evt = Event(self._env)
+        heapq.heappush(self._falling, (-threshold, next(self._seq), evt))
+        self._reschedule()
+        return evt
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _settle(self) -> None:
+        """Bring _level up to the current time."""
+        now = self._env._now
+        if now != self._since:
+            level = self._level + self._rate * (now - self._since)
+            self._level = min(max(level, 0), self._capacity)
+            self._since = now
+
+    def _update(self) -> None:
+        """Serve whatever the current level allows, then reschedule."""
+        getters = self._getters
+        putters = self._putters
+        progress = True
+        while progress:
+            progress = False
+            while getters and (
+                getters[0][1]._value is _CANCELLED or self._level >= getters[0][0]
+            ):
+                amount, evt = getters.popleft()
+                if evt._value is _PENDING:
+                    self._level -= amount
+                    evt._on_cancel = self._undo_get
+                    evt.succeed(amount)
+                    progress = True
+            while putters and (
+                putters[0][1]._value is _CANCELLED
+                or self._level + putters[0][0] <= self._capacity
+            ):
+                amount, evt = putters.popleft()
+                if evt._value is _PENDING:
+                    self._level += amount
+                    evt._on_cancel = None
+                    evt.succeed(amount)
+                    progress = True
+        rising = self._rising
+        while rising and (
+            rising[0][2]._value is _CANCELLED or self._level >= rising[0][0]
+        ):
+            heapq.heappop(rising)[2].succeed(self._level)
+        falling = self._falling
+        while falling and (
+            falling[0][2]._value is _CANCELLED or self._level <= -falling[0][0]
+        ):
+            heapq.heappop(falling)[2].succeed(self._level)
+        self._reschedule()
+
+    def _reschedule(self) -> None:
+        """Schedule a wakeup for the first pending request the flows satisfy."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        level = self._level
+        rate = self._rate
+        target = None
+        if rate > 0:
+            # Rising: the oldest getter, or the lowest at-least threshold.
+            if self._getters:
+                target = self._getters[0][0]
+            if self._rising and (target is None or self._rising[0][0] < target):
+                target = self._rising[0][0]
+            if target is not None and target > self._capacity:
+                target = None
+        elif rate < 0:
+            # Falling: room for the oldest putter, or the highest at-most threshold.
+            if self._putters:
+                target = self._capacity - self._putters[0][0]
+            if self._falling and (target is None or -self._falling[0][0] > target):
+                target = -self._falling[0][0]
+            if target is not None and target < 0:
+                target = None
+        if target is None:
+            return
+        self._target = target
+        # max() guards against rounding when the crossing is due right now.
+        self._timer = Timeout(self._env, max((target - level) / rate, 0))
+        self._timer._add_waiter(self._wake)
+
+    def _wake(self, _value) -> None:
+        """The flows have brought the level to _target: serve and reschedule."""
+        self._timer = None
+        self._settle()
+        # Use the exact target rather than a level that rounding left
+        # a hair short of it.
+        self._level = self._target
+        self._update()
+
+    def _withdrawn(self, _value) -> None:
+        """A blocked get or put was cancelled: the ones behind it may now fit."""
+        self._settle()
+        self._update()
+
+    def _undo_get(self, amount: Amount) -> None:
+        """Restore *amount* to the level after a get is cancelled."""
+        self._settle()
+        self._level = min(self._level + amount, self._capacity)
+        self._update()
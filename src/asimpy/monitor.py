@@ -0,0 +1,144 @@
+"""Time-weighted statistics of a value that changes at discrete instants."""
+
+import math
+from typing import Union
+
+Amount = Union[int, float]
+
+
+class TimeWeighted:
+    """Time-weighted mean, variance, extremes and time-at-level of a value.
+
+    A value such as a queue length or a container level is constant between
+    state changes, so its statistics over time can be kept exactly by
+    calling record(new_value) at each change instead of sampling it:
+
+        busy = TimeWeighted(env)
+        busy.record(busy.value + 1)
+        ...
+        print(busy.mean, busy.time_at_level())
+
+    Each change folds the interval that just ended into a weighted Welford
+    update (West, 1979), so the mean and variance need O(1) memory and are
+    numerically stable over long runs.  record() with an unchanged value
+    does nothing.  Statistics include the interval from the last change up
+    to the current simulated time, without modifying the accumulators.
+
+    time_at_level() keeps one total per distinct value, which is small for
+    counts; pass levels=False for values such as float container levels
+    that rarely repeat.
+
+    Resource, Queue, Container and Store create one of these when they are
+    constructed with monitor=True, and update it themselves.
+    """
+
+    __slots__ = (
+        "_env",
+        "_value",
+        "_since",
+        "_start",
+        "_weight",
+        "_mean",
+        "_m2",
+        "_min",
+        "_max",
+        "_levels",
+    )
+
+    def __init__(self, env, value: Amount = 0, levels: bool = True):
+        self._env = env
+        self._value = value
+        self._since = env.now
+        self._start = env.now
+        # Weighted Welford accumulators over completed intervals.
+        self._weight = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = value
+        self._max = value
+        self._levels: dict | None = {} if levels else None
+
+    def record(self, value: Amount) -> None:
+        """Note that the value changed to `value` at the current time."""
+        if value == self._value:
+            return
+        now = self._env._now
+        old = self._value
+        dt = now - self._since
+        if dt:
+            self._weight += dt
+            delta = old - self._mean
+            self._mean += delta * dt / self._weight
+            self._m2 += dt * delta * (old - self._mean)
+            if self._levels is not None:
+                self._levels[old] = self._levels.get(old, 0) + dt
+        self._value = value
+        self._since = now
+        if value < self._min:
+            self._min = value
+        elif value > self._max:
+            self._max = value
+
+    @property
+    def value(self) -> Amount:
+        """Current value."""
+        return self._value
+
+    @property
+    def duration(self) -> float:
+        """Simulated time covered so far."""
+        return self._env.now - self._start
+
+    @property
+    def min(self) -> Amount:
+        """Smallest value held."""
+        return self._min
+
+    @property
+    def max(self) -> Amount:
+        """Largest value held."""
+        return self._max
+
+    @property
+    def mean(self) -> float:
+        """Time-weighted mean (the current value if no time has passed)."""
+        weight, mean, _ = self._totals()
+        return mean if weight else self._value
+
+    @property
+    def variance(self) -> float:
+        """Time-weighted population variance (0 if no time has passed)."""
+        weight, _, m2 = self._totals()
+        return m2 / weight if weight else 0.0
+
+    @property
+    def std(self) -> float:
+        """Time-weighted standard deviation."""
+        return math.sqrt(self.variance)
+
+    def time_at_level(self) -> dict:
+        """Return a dict mapping each value held to the total time it was held."""
+        if self._levels is None:
+            raise ValueError("time at level was not recorded (levels=False)")
+        result = dict(self._levels)
+        dt = self._env.now - self._since
+        if dt:
+            result[self._value] = result.get(self._value, 0) + dt
+        return result
+
+    def _totals(self) -> tuple:
+        """Return (weight, mean, m2) including the interval still open."""
+        weight, mean, m2 = self._weight, self._mean, self._m2
+        dt = self._env.now - self._since
+        if dt:
+            weight += dt
+            delta = self._value - mean
+            mean += delta * dt / weight
+            m2 += dt * delta * (self._value - mean)
+        return weight, mean, m2
+
+    def __repr__(self) -> str:
+        return (
+            f"TimeWeighted(value={self._value}, mean={self.mean:.6g}, "
+            f"min={self._min}, max={self._max})"
+        )
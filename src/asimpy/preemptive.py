@@ -1,15 +1,15 @@
 """Preemptive shared resource."""
 
-import bisect
-import itertools
 from dataclasses import dataclass
+import heapq
 from typing import TYPE_CHECKING
 
-from .event import _CANCELLED, Event
+from .event import Event
+from .timeout import Timeout
 
 if TYPE_CHECKING:
     from .environment import Environment
-    from .process import Process
+    from .process import _Driver
 
 
 @dataclass
@@ -17,14 +17,52 @@ class Preempted:
     """Interrupt cause delivered when a process is evicted from a PreemptiveResource.
 
     Attributes:
-        by: the process that caused the preemption.
+        by: the process or task that caused the preemption (None for a
+            serve() job).
         usage_since: simulation time when the preempted process acquired the resource.
     """
 
-    by: "Process"
+    by: "_Driver | None"
     usage_since: float
 
 
+class _Claim:
+    """One request: first waiting for the resource, then holding it.
+
+    `event` is None once an acquire has been granted, or once any request
+    has been withdrawn or finished; `held` is True while it holds a unit.
+    The heaps drop entries whose claim has moved on lazily, when they
+    reach the front.
+
+    A job submitted with serve() has `remaining` set to the service time it
+    still needs, and `timer` is the Timeout for its completion while it is
+    being served.
+    """
+
+    __slots__ = (
+        "priority",
+        "seq",
+        "process",
+        "event",
+        "since",
+        "held",
+        "remaining",
+        "timer",
+    )
+
+    def __init__(
+        self, priority: int, seq: int, process: "_Driver | None", event: Event
+    ):
+        self.priority = priority
+        self.seq = seq
+        self.process = process
+        self.event: Event | None = event
+        self.since: float | int = 0
+        self.held = False
+        self.remaining: float | int | None = None
+        self.timer: Timeout | None = None
+
+
 class PreemptiveResource:
     """Shared resource where higher-priority processes can preempt lower-priority users.
 
@@ -36,29 +74,47 @@ class PreemptiveResource:
 
     Do *not* call `release()` when handling a `Preempted` interrupt:
     the preempted process has already been removed from the user list by the preemptor.
+
+    Waiters are kept in a heap ordered best first and users in a heap
+    ordered worst first; a dict finds each user's claim by process.  Release
+    and cancellation mark the claim in O(1) and leave its heap entry to be
+    skipped when it reaches the front, and a heap is rebuilt once such dead
+    entries are the majority, so every operation is amortized O(log n).
     """
 
-    # Class-level counter ensures stable FIFO ordering among equal-priority requests.
-    _seq = itertools.count()
+    # Never rebuild a heap with fewer dead entries than this.
+    _COMPACT_MIN = 64
 
     def __init__(self, env: "Environment", capacity: int = 1):
         if capacity <= 0:
             raise ValueError(f"capacity must be positive, got {capacity}")
         self._env = env
         self.capacity = capacity
-        self._users: list = []  # sorted list of [priority, seq, usage_since, process]
-        self._waiters: list = []  # sorted list of [priority, seq, process, event]
+        self._count = 0
+        # Current users, worst first: (-priority, -seq, claim) tuples.
+        self._users: list = []
+        self._dead_users = 0
+        # Waiting requests, best first: (priority, seq, claim) tuples.
+        self._waiters: list = []
+        self._dead_waiters = 0
+        # process -> its _Claim, or a list of claims if it holds several units.
+        self._held: dict = {}
 
     @property
     def count(self) -> int:
         """Current number of active users."""
-        return len(self._users)
+        return self._count
+
+    def acquire(self, priority: int = 0, preempt: bool = True) -> Event:
+        """Return an Event that triggers when one unit has been acquired.
 
-    async def acquire(self, priority: int = 0, preempt: bool = True) -> None:
-        """Acquire one unit of the resource.
+        The event's value is a token identifying this hold; pass it to
+        release() to give the unit back.  Like Resource.acquire(), the event
+        can be raced in FirstOf; cancelling it withdraws the request, or
+        releases the unit if it was already granted.
 
-        Must be called from within a Process.run() coroutine; the calling
-        process is identified via env._active_process.
+        The process calling acquire() (env._active_process) is the one that
+        will be interrupted if this hold is later preempted.
 
         Args:
             priority: lower value = higher priority (0 is best).
@@ -66,71 +122,204 @@ class PreemptiveResource:
                 when the resource is full and that user has lower priority
                 than this request.
         """
-        process = self._env._active_process
-        assert process is not None
-        seq = next(PreemptiveResource._seq)
-
-        if len(self._users) < self.capacity:
-            user_rec = [priority, seq, self._env.now, process]
-            bisect.insort(self._users, user_rec)
-            evt = Event(self._env)
-            # _on_cancel removes the user record if FirstOf later discards this event.
-            evt._on_cancel = lambda v, rec=user_rec: self._users.remove(rec)
-            evt.succeed()
-            await evt
+        env = self._env
+        process = env._active_process
+        # The environment's counter gives stable FIFO ordering among
+        # equal-priority requests, independent of other simulations.
+        evt = Event(env)
+        claim = _Claim(priority, next(env._serial), process, evt)
+        # _on_cancel withdraws the request, or gives the unit back if it was
+        # already granted, when FirstOf or an interrupt discards the event.
+        evt._on_cancel = lambda v, c=claim: self._cancel(c, v)
+
+        self._request(claim, preempt)
+        return evt
+
+    def serve(
+        self, demand: float | int, priority: int = 0, preempt: bool = True
+    ) -> Event:
+        """Return an Event that triggers once `demand` units of service are done.
+
+        The job waits for a unit like acquire(), holds it for `demand` time
+        units, and then releases it by itself.  If a better-priority request
+        preempts it, the resource records how much service is left, puts
+        the job back in the queue at its original position, and resumes it
+        later (preemptive-resume).  No Interrupt is raised and no process
+        has to re-acquire.
+
+        Cancelling the event (e.g. from FirstOf) withdraws the job and
+        frees its unit if it is being served.
+
+        Args:
+            demand: total service time the job needs.
+            priority: lower value = higher priority (0 is best).
+            preempt: if True, the job may preempt the lowest-priority
+                current user when the resource is full.
+        """
+        if demand < 0:
+            raise ValueError(f"demand must be non-negative, got {demand}")
+        env = self._env
+        evt = Event(env)
+        claim = _Claim(priority, next(env._serial), None, evt)
+        claim.remaining = demand
+        evt._on_cancel = lambda v, c=claim: self._cancel(c, v)
+        self._request(claim, preempt)
+        return evt
+
+    def release(self, token: "_Claim | None" = None) -> None:
+        """Release one unit of the resource.
+
+        `token` is the value of the event returned by acquire().  Without
+        it, the unit held by the calling process (env._active_process) is
+        released.  Do not call this when handling a Preempted interrupt:
+        the preempted process has already been removed from the user list
+        by the preemptor.
+
+        Raises:
+            RuntimeError: if the token (or the calling process) does not
+                hold a unit of this resource.
+        """
+        if token is None:
+            process = self._env._active_process
+            held = self._held.get(process)
+            if held is None:
+                raise RuntimeError(f"{process} is not a current user of this resource")
+            token = held[0] if type(held) is list else held
+        else:
+            held = self._held.get(token.process)
+            if held is not token and (type(held) is not list or token not in held):
+                raise RuntimeError("token does not hold a unit of this resource")
+        self._free(token)
+
+    def _request(self, claim: _Claim, preempt: bool) -> None:
+        """Grant `claim` now, by preemption if allowed, or queue it."""
+        if self._count < self.capacity:
+            self._grant(claim)
             return
 
-        if preempt and self._users:
-            worst = self._users[-1]  # highest priority number = worst priority
-            if worst[0] > priority:
-                self._users.remove(worst)
-                preempted_proc = worst[3]
-                preempted_since = worst[2]
-                user_rec = [priority, seq, self._env.now, process]
-                bisect.insort(self._users, user_rec)
-                evt = Event(self._env)
-                evt._on_cancel = lambda v, rec=user_rec: self._users.remove(rec)
-                evt.succeed()
-                if preempted_proc is not None:
-                    preempted_proc.interrupt(
-                        Preempted(by=process, usage_since=preempted_since)
+        if preempt and self._count:
+            worst = self._worst()
+            if worst.priority > claim.priority:
+                heapq.heappop(self._users)
+                self._unhold(worst)
+                self._grant(claim)
+                if worst.remaining is not None:
+                    self._suspend(worst)
+                elif worst.process is not None:
+                    worst.process.interrupt(
+                        Preempted(by=claim.process, usage_since=worst.since)
                     )
-                await evt
                 return
 
-        evt = Event(self._env)
-        waiter_rec = [priority, seq, process, evt]
-        bisect.insort(self._waiters, waiter_rec)
-        # Lazy deletion in release() skips cancelled entries; no _on_cancel needed.
-        await evt
+        heapq.heappush(self._waiters, (claim.priority, claim.seq, claim))
 
-    def release(self) -> None:
-        """Release one unit of the resource.
+    def _grant(self, claim: _Claim) -> None:
+        """Make `claim` a current user; trigger its event or start its service."""
+        claim.held = True
+        env = self._env
+        claim.since = env._now
+        self._count += 1
+        heapq.heappush(self._users, (-claim.priority, -claim.seq, claim))
+        if claim.remaining is not None:
+            timer = claim.timer = Timeout(env, claim.remaining)
+            timer._add_waiter(lambda _, c=claim: self._finish(c))
+            return
+        held = self._held.get(claim.process)
+        if held is None:
+            self._held[claim.process] = claim
+        elif type(held) is list:
+            held.append(claim)
+        else:
+            self._held[claim.process] = [held, claim]
+        evt = claim.event
+        # Only claims still waiting for their event are granted.
+        assert evt is not None
+        # Drop the claim -> event -> _on_cancel -> claim cycle so that
+        # finished claims are freed by reference counting, not the GC.
+        claim.event = None
+        evt.succeed(claim)
 
-        The calling process is identified via env._active_process.
-        Do not call this when handling a Preempted interrupt: the preempted
-        process has already been removed from the user list by the preemptor.
+    def _suspend(self, claim: _Claim) -> None:
+        """Stop serving a preempted job and queue it with its remaining demand."""
+        timer = claim.timer
+        remaining = claim.remaining
+        # Only serve() jobs are suspended, and they are timed while held.
+        assert timer is not None and remaining is not None
+        timer.cancel()
+        claim.timer = None
+        claim.remaining = remaining - (self._env._now - claim.since)
+        heapq.heappush(self._waiters, (claim.priority, claim.seq, claim))
 
-        Raises:
-            RuntimeError: if the calling process is not a current user.
+    def _finish(self, claim: _Claim) -> None:
+        """Complete a job whose service time has run out."""
+        claim.timer = None
+        claim.remaining = 0
+        evt = claim.event
+        # Cancelling the event stops the timer, so the job is still live here.
+        assert evt is not None
+        claim.event = None
+        self._free(claim)
+        evt.succeed()
+
+    def _unhold(self, claim: _Claim) -> None:
+        """Take `claim` out of the current users.
+
+        Its heap entry is left to the caller.
         """
-        process = self._env._active_process
-        for i, user in enumerate(self._users):
-            if user[3] is process:
-                del self._users[i]
-                break
+        claim.held = False
+        self._count -= 1
+        if claim.remaining is not None:
+            return
+        held = self._held[claim.process]
+        if held is claim:
+            del self._held[claim.process]
         else:
-            raise RuntimeError(f"{process} is not a current user of this resource")
+            held.remove(claim)
+            if len(held) == 1:
+                self._held[claim.process] = held[0]
+
+    def _free(self, claim: _Claim) -> None:
+        """Release a granted `claim` and admit the best live waiter."""
+        self._unhold(claim)
+        self._dead_users += 1
+        if self._dead_users >= self._COMPACT_MIN and 2 * self._dead_users > len(
+            self._users
+        ):
+            self._users = [u for u in self._users if u[2].held]
+            heapq.heapify(self._users)
+            self._dead_users = 0
 
-        # Lazy deletion: skip waiters whose events were cancelled.
-        while self._waiters:
-            waiter = self._waiters[0]
-            if waiter[3]._value is _CANCELLED:
-                self._waiters.pop(0)
+        waiters = self._waiters
+        while waiters:
+            claim = heapq.heappop(waiters)[2]
+            if claim.event is None:
+                self._dead_waiters -= 1
                 continue
-            self._waiters.pop(0)
-            w_priority, w_seq, w_process, w_evt = waiter
-            user_rec = [w_priority, w_seq, self._env.now, w_process]
-            bisect.insort(self._users, user_rec)
-            w_evt.succeed()
+            self._grant(claim)
             break
+
+    def _worst(self) -> _Claim:
+        """Return the current user with the worst priority."""
+        users = self._users
+        while not users[0][2].held:
+            heapq.heappop(users)
+            self._dead_users -= 1
+        return users[0][2]
+
+    def _cancel(self, claim: _Claim, value: object) -> None:
+        """Release a granted claim, or withdraw a waiting one."""
+        if claim.held:
+            if claim.timer is not None:
+                claim.timer.cancel()
+                claim.timer = None
+            claim.event = None
+            self._free(claim)
+        elif claim.event is not None:
+            claim.event = None
+            self._dead_waiters += 1
+            if self._dead_waiters >= self._COMPACT_MIN and 2 * self._dead_waiters > len(
+                self._waiters
+            ):
+                self._waiters = [w for w in self._waiters if w[2].event is not None]
+                heapq.heapify(self._waiters)
+                self._dead_waiters = 0
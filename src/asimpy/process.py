@@ -1,25 +1,47 @@
-"""Abstract base class for simulation processes."""
+"""Simulation processes: Process subclasses and function-based Tasks."""
 
 from abc import ABC, abstractmethod
-from functools import partial
+from collections.abc import Callable, Coroutine
+import logging
 from typing import TYPE_CHECKING, Any
 
-from .event import _CANCELLED, _PENDING, Event
+from .event import _CANCELLED, _PENDING, Event, _Triggered
 from .interrupt import Interrupt
+from .sleep import Sleep
 from .timeout import Timeout
 
 if TYPE_CHECKING:
     from .environment import Environment
 
 
-class Process(ABC):
-    """Abstract base class for all simulation processes.
+class _Driver:
+    """Drives a coroutine through the simulation.
 
-    Subclasses implement run() as an async method.  Optionally override
-    init() for setup that must happen before the coroutine is created.
+    Holds the state and the _loop/resume machinery shared by Process and
+    Task.  Uses __slots__ so that Task instances carry no __dict__.
+
+    Awaiting a process (or an event from join()) waits for it to finish:
+
+        result = await worker
+
+    The await returns whatever the coroutine returned, or raises the
+    exception that ended it.  Processes can also be passed to AllOf and
+    FirstOf.  Join events are only created when someone asks for one, so a
+    process that nobody joins allocates nothing extra.
     """
 
-    def __init__(self, env: "Environment", *args: Any, **kwargs: Any):
+    __slots__ = (
+        "_env",
+        "_coro",
+        "_done",
+        "_started",
+        "_interrupt",
+        "_current_event",
+        "_result",
+    )
+
+    def _start(self, env: "Environment", coro: Coroutine) -> None:
+        """Initialize driver state and schedule the first step of `coro`."""
         self._env = env
         self._done = False
         # True after the first coro.send(None) call.  Throwing into an
@@ -27,29 +49,45 @@ class Process(ABC):
         self._started = False
         self._interrupt: Interrupt | None = None
         self._current_event: Event | None = None
-        self.init(*args, **kwargs)
-        self._coro = self.run()
+        # While running: None, or the list of events returned by join().
+        # Once _done: the coroutine's return value or exception.
+        self._result: Any = None
+        self._coro = coro
         env.immediate(self._loop)
 
-    def init(self, *args: Any, **kwargs: Any) -> None:
-        """Optional subclass setup hook, called before the coroutine is created."""
-
-    @abstractmethod
-    async def run(self) -> None:
-        """Implement process behaviour here."""
-
     @property
     def now(self) -> float | int:
         """Shortcut to the current simulation time."""
         return self._env.now
 
-    def log(self, name: str, message: str) -> None:
-        """Record a log message in the environment."""
-        self._env.log(name, message)
+    def join(self) -> Event:
+        """Return an Event that triggers with this process's result.
 
-    def timeout(self, delay: float | int) -> Timeout:
-        """Return a Timeout event for `delay` simulated time units."""
-        return self._env.timeout(delay)
+        If the coroutine raised, awaiting the event re-raises the exception.
+        Each call returns a new Event, so cancelling one (e.g. as the loser
+        of a FirstOf) does not affect other joiners.
+        """
+        if self._done:
+            return _Triggered(self._env, self._result)
+        evt = Event(self._env)
+        if self._result is None:
+            self._result = [evt]
+        else:
+            self._result.append(evt)
+        return evt
+
+    def __await__(self):
+        return self.join().__await__()
+
+    @staticmethod
+    def _deliver(joiners: list[Event], result: Any) -> bool:
+        """Trigger pending `joiners` with `result`; return True if any were."""
+        delivered = False
+        for evt in joiners:
+            if evt._value is _PENDING:
+                evt.succeed(result)
+                delivered = True
+        return delivered
 
     def interrupt(self, cause: Any = None) -> None:
         """Throw an Interrupt into this process.
@@ -105,18 +143,31 @@ class Process(ABC):
                     self._current_event = None
                     continue
 
-                # Event is still pending: park until it fires.
-                yielded._add_waiter(self.resume)
+                # Event is still pending: park until it fires.  A Sleep
+                # schedules this process directly instead of via resume().
+                if type(yielded) is Sleep:
+                    yielded._park(self)
+                else:
+                    yielded._add_waiter(self.resume)
                 break
 
-        except StopIteration:
+        except StopIteration as exc:
             self._done = True
             self._current_event = None
+            joiners = self._result
+            self._result = exc.value
+            if joiners is not None:
+                self._deliver(joiners, exc.value)
 
-        except Exception:
+        except Exception as exc:
             self._done = True
             self._current_event = None
-            raise
+            joiners = self._result
+            self._result = exc
+            # A process that someone is waiting for hands its exception to
+            # them; otherwise it propagates out of Environment.run().
+            if joiners is None or not self._deliver(joiners, exc):
+                raise
 
         finally:
             self._env._active_process = None
@@ -124,8 +175,71 @@ class Process(ABC):
     def resume(self, value: Any = None) -> None:
         """Called by an Event when it triggers; re-schedules _loop.
 
-        Uses functools.partial (a C-level callable) to avoid creating a Python
-        closure, keeping per-resume overhead low.
+        Pushes a (_loop, value) pair straight onto the ready queue instead
+        of wrapping it in a partial and going through immediate().
         """
         if not self._done:
-            self._env.immediate(partial(self._loop, value))
+            self._env._ready.append((self._loop, value))
+
+
+class Process(_Driver, ABC):
+    """Abstract base class for all simulation processes.
+
+    Subclasses implement run() as an async method.  Optionally override
+    init() for setup that must happen before the coroutine is created.
+    """
+
+    def __init__(self, env: "Environment", *args: Any, **kwargs: Any):
+        # init() may rely on self._env, so set it before calling init().
+        self._env = env
+        self.init(*args, **kwargs)
+        self._start(env, self.run())
+
+    def init(self, *args: Any, **kwargs: Any) -> None:
+        """Optional subclass setup hook, called before the coroutine is created."""
+
+    @abstractmethod
+    async def run(self) -> None:
+        """Implement process behaviour here."""
+
+    def log(
+        self,
+        name: str,
+        message: str | Callable[[], str],
+        *args: Any,
+        level: int = logging.INFO,
+    ) -> None:
+        """Record a log message in the environment (see Environment.log)."""
+        env = self._env
+        if level >= env._log_level:
+            env.log(name, message, *args, level=level)
+
+    def timeout(self, delay: float | int) -> Timeout:
+        """Return a Timeout event for `delay` simulated time units."""
+        return self._env.timeout(delay)
+
+    def sleep(self, delay: float | int) -> Sleep:
+        """Return a Sleep that suspends this process for `delay` time units."""
+        return Sleep(self._env, delay)
+
+
+class Task(_Driver):
+    """A process that drives a bare coroutine, without subclassing Process.
+
+    Create one with env.process(coro):
+
+        async def customer(env, counter):
+            await counter.acquire()
+            await env.sleep(5)
+            counter.release()
+
+        env.process(customer(env, counter))
+
+    A Task has no __dict__, so it is much smaller than a Process and cheaper
+    to create.  It supports interrupt() and the same tight-loop fast path.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, env: "Environment", coro: Coroutine):
+        self._start(env, coro)
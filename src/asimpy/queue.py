@@ -1,9 +1,11 @@
 """FIFO queues with blocking and non-blocking operations."""
 
-import bisect
 from collections import deque
-from typing import Any
+import heapq
+import itertools
+from typing import Any, Callable
 from .event import _CANCELLED, Event
+from .monitor import TimeWeighted
 
 
 class QueueEmpty(Exception):
@@ -19,9 +21,20 @@ class Queue:
 
     Blocking operations (get, put) return an Event; await it for the result.
     Non-blocking operations (try_get, try_put) raise on failure.
+
+    Blocked getters and putters are served oldest first.  One that is
+    cancelled (e.g. the loser of a FirstOf timeout) stays in its deque and
+    is counted as dead: dead entries at the front are skipped by the next
+    put or get, and a deque is rebuilt once dead entries outnumber live
+    ones, as in Store.
+
+    With monitor=True, `monitor` is a TimeWeighted that tracks size().
     """
 
-    def __init__(self, env, capacity: int | None = None):
+    # Never rebuild a waiter deque with fewer dead entries than this.
+    _COMPACT_MIN = 64
+
+    def __init__(self, env, capacity: int | None = None, monitor: bool = False):
         if capacity is not None and capacity <= 0:
             raise ValueError(f"capacity must be a positive integer, got {capacity}")
         self._env = env
@@ -29,6 +42,10 @@ class Queue:
         self._items: deque = deque()
         self._getters: deque = deque()  # pending Event objects
         self._putters: deque = deque()  # (Event, item) pairs
+        # Cancelled entries still in _getters and _putters.
+        self._dead_getters = 0
+        self._dead_putters = 0
+        self._monitor = TimeWeighted(env) if monitor else None
 
     # ------------------------------------------------------------------
     # Internal storage helpers (overridden by PriorityQueue)
@@ -45,6 +62,8 @@ class Queue:
     def _put_back(self, item: Any) -> None:
         """Return a previously removed item to the front of the store."""
         self._items.appendleft(item)
+        if self._monitor is not None:
+            self._monitor.record(len(self._items))
 
     # ------------------------------------------------------------------
     # Introspection
@@ -62,6 +81,11 @@ class Queue:
         """Number of items currently in the queue."""
         return len(self._items)
 
+    @property
+    def monitor(self) -> TimeWeighted | None:
+        """Time-weighted statistics of size(), or None if not monitored."""
+        return self._monitor
+
     # ------------------------------------------------------------------
     # Blocking operations (return Event)
     # ------------------------------------------------------------------
@@ -71,12 +95,15 @@ class Queue:
         if self._items:
             item = self._pop()
             self._promote_putter()
+            if self._monitor is not None:
+                self._monitor.record(len(self._items))
             evt = Event(self._env)
-            evt._on_cancel = lambda v: self._put_back(v)
+            evt._on_cancel = self._put_back
             evt.succeed(item)
             return evt
 
         evt = Event(self._env)
+        evt._on_cancel = self._getter_died
         self._getters.append(evt)
         return evt
 
@@ -88,24 +115,22 @@ class Queue:
         """
         # Deliver directly to a non-cancelled waiting getter.
         while self._getters:
-            getter = self._getters[0]
+            getter = self._getters.popleft()
             if getter._value is _CANCELLED:
-                self._getters.popleft()
+                self._dead_getters -= 1
                 continue
-            self._getters.popleft()
-            getter._on_cancel = lambda v: self._put_back(v)
+            getter._on_cancel = self._put_back
             getter.succeed(item)
-            result = Event(self._env)
-            result.succeed(True)
-            return result
+            return self._env._put_done
 
         if not self.is_full():
             self._add(item)
-            result = Event(self._env)
-            result.succeed(True)
-            return result
+            if self._monitor is not None:
+                self._monitor.record(len(self._items))
+            return self._env._put_done
 
         evt = Event(self._env)
+        evt._on_cancel = self._putter_died
         self._putters.append((evt, item))
         return evt
 
@@ -116,7 +141,10 @@ class Queue:
     def try_get(self) -> Any:
         """Remove and return the next item, or raise QueueEmpty."""
         if self._items:
-            return self._pop()
+            item = self._pop()
+            if self._monitor is not None:
+                self._monitor.record(len(self._items))
+            return item
         raise QueueEmpty("queue is empty")
 
     def try_put(self, item: Any) -> None:
@@ -124,6 +152,8 @@ class Queue:
         if self.is_full():
             raise QueueFull("queue is at capacity")
         self._add(item)
+        if self._monitor is not None:
+            self._monitor.record(len(self._items))
 
     # ------------------------------------------------------------------
     # Internal
@@ -132,36 +162,158 @@ class Queue:
     def _promote_putter(self) -> None:
         """Move one waiting putter's item into the queue (lazy deletion)."""
         while self._putters:
-            evt, item = self._putters[0]
+            evt, item = self._putters.popleft()
             if evt._value is _CANCELLED:
-                self._putters.popleft()
+                self._dead_putters -= 1
                 continue
-            self._putters.popleft()
             self._add(item)
+            evt._on_cancel = None
             evt.succeed(True)
             break
 
+    def _getter_died(self, _value: Any) -> None:
+        """Count a cancelled getter; rebuild the deque if they dominate."""
+        self._dead_getters += 1
+        if self._dead_getters >= self._COMPACT_MIN and 2 * self._dead_getters > len(
+            self._getters
+        ):
+            self._getters = deque(
+                evt for evt in self._getters if evt._value is not _CANCELLED
+            )
+            self._dead_getters = 0
+
+    def _putter_died(self, _value: Any) -> None:
+        """Count a cancelled putter; rebuild the deque if they dominate."""
+        self._dead_putters += 1
+        if self._dead_putters >= self._COMPACT_MIN and 2 * self._dead_putters > len(
+            self._putters
+        ):
+            self._putters = deque(
+                entry for entry in self._putters if entry[0]._value is not _CANCELLED
+            )
+            self._dead_putters = 0
+
 
 class PriorityQueue(Queue):
-    """Queue that serves items in sorted (ascending) order.
+    """Queue that serves items in ascending order of priority.
 
-    Uses bisect.insort to maintain the internal list in sorted order.
-    Items must be comparable.
+    An item's priority is, in order of preference, the `priority` passed to
+    put() or try_put(), `key(item)` if the queue was created with a key
+    function, or the item itself.  Lower priorities come out first.
+
+    Items are kept in a binary heap of (priority, seq, item) entries, so put
+    and get are O(log n).  seq comes from an insertion counter, so items
+    with equal priorities come out in FIFO order and the items themselves
+    are never compared.  Priorities must support < and ==, as numbers,
+    strings and tuples do.
+
+    Passing a priority (or a key) is cheaper than wrapping each item in a
+    (priority, item) tuple: no wrapper is allocated, the key is evaluated
+    once per put, and comparisons stop at the priority.
     """
 
-    def __init__(self, env, capacity: int | None = None):
-        super().__init__(env, capacity)
-        # Use a plain list for bisect operations instead of a deque.
+    def __init__(
+        self,
+        env,
+        capacity: int | None = None,
+        key: Callable[[Any], Any] | None = None,
+        monitor: bool = False,
+    ):
+        super().__init__(env, capacity, monitor)
+        self._key = key
+        # Heap of (priority, seq, item) entries instead of a deque.
         self._items: list = []
+        self._seq = itertools.count()
+        # Put-backs count down from -1 so a returned item goes ahead of
+        # items with the same priority, which is where it was before it
+        # was removed.
+        self._back_seq = itertools.count(-1, -1)
+
+    def _priority(self, item: Any) -> Any:
+        """Return the priority of an item that was put without one."""
+        key = self._key
+        return item if key is None else key(item)
 
     def _add(self, item: Any) -> None:
-        """Insert item in sorted order."""
-        bisect.insort(self._items, item)
+        """Push item onto the heap."""
+        heapq.heappush(self._items, (self._priority(item), next(self._seq), item))
 
     def _pop(self) -> Any:
-        """Remove and return the smallest item."""
-        return self._items.pop(0)
+        """Remove and return the item with the lowest priority."""
+        return heapq.heappop(self._items)[2]
 
-    def _put_back(self, item: Any) -> None:
-        """Re-insert a cancelled item in sorted order."""
-        bisect.insort(self._items, item)
+    def _put_back(self, item: Any, priority: Any = None) -> None:
+        """Re-insert a cancelled item ahead of items with the same priority."""
+        if priority is None:
+            priority = self._priority(item)
+        heapq.heappush(self._items, (priority, next(self._back_seq), item))
+        if self._monitor is not None:
+            self._monitor.record(len(self._items))
+
+    def get(self) -> Event:
+        """Return an Event whose value is the item with the lowest priority."""
+        if self._items:
+            priority, _, item = heapq.heappop(self._items)
+            self._promote_putter()
+            if self._monitor is not None:
+                self._monitor.record(len(self._items))
+            evt = Event(self._env)
+            evt._on_cancel = lambda v, p=priority: self._put_back(v, p)
+            evt.succeed(item)
+            return evt
+
+        evt = Event(self._env)
+        evt._on_cancel = self._getter_died
+        self._getters.append(evt)
+        return evt
+
+    def put(self, item: Any, priority: Any = None) -> Event:
+        """Return an Event that resolves to True when `item` is enqueued.
+
+        `priority` overrides the key function (or the item itself) as the
+        item's priority.
+        """
+        if priority is None:
+            priority = self._priority(item)
+
+        while self._getters:
+            getter = self._getters.popleft()
+            if getter._value is _CANCELLED:
+                self._dead_getters -= 1
+                continue
+            getter._on_cancel = lambda v, p=priority: self._put_back(v, p)
+            getter.succeed(item)
+            return self._env._put_done
+
+        if not self.is_full():
+            heapq.heappush(self._items, (priority, next(self._seq), item))
+            if self._monitor is not None:
+                self._monitor.record(len(self._items))
+            return self._env._put_done
+
+        evt = Event(self._env)
+        evt._on_cancel = self._putter_died
+        self._putters.append((evt, (priority, item)))
+        return evt
+
+    def try_put(self, item: Any, priority: Any = None) -> None:
+        """Add `item` with the given (or derived) priority, or raise QueueFull."""
+        if self.is_full():
+            raise QueueFull("queue is at capacity")
+        if priority is None:
+            priority = self._priority(item)
+        heapq.heappush(self._items, (priority, next(self._seq), item))
+        if self._monitor is not None:
+            self._monitor.record(len(self._items))
+
+    def _promote_putter(self) -> None:
+        """Move one waiting putter's item into the heap (lazy deletion)."""
+        while self._putters:
+            evt, (priority, item) = self._putters.popleft()
+            if evt._value is _CANCELLED:
+                self._dead_putters -= 1
+                continue
+            heapq.heappush(self._items, (priority, next(self._seq), item))
+            evt._on_cancel = None
+            evt.succeed(True)
+            break
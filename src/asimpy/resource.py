@@ -2,6 +2,8 @@
 
 from collections import deque
 from .event import _CANCELLED, Event
+from .monitor import TimeWeighted
+from .tally import Tally
 
 
 class Resource:
@@ -9,21 +11,44 @@ class Resource:
 
     Processes acquire a slot (blocking if all slots are taken) and release it
     when done.  Supports async context manager protocol.
+
+    With monitor=True, `monitor` is a TimeWeighted that tracks `count`.
+    With waits=True, `waits` is a Tally of the time from each acquire() to
+    the grant of its slot, zero for immediate grants.  Requests cancelled
+    while waiting are never added, and an immediate grant that is
+    cancelled (e.g. by FirstOf) has its zero removed again, so `waits`
+    only counts requests that held a slot.
     """
 
-    def __init__(self, env, capacity: int = 1):
+    def __init__(
+        self, env, capacity: int = 1, monitor: bool = False, waits: bool = False
+    ):
         if capacity <= 0:
             raise ValueError(f"capacity must be positive, got {capacity}")
         self._env = env
         self.capacity = capacity
         self._count = 0
         self._waiters: deque = deque()  # pending Event objects
+        self._monitor = TimeWeighted(env) if monitor else None
+        self._waits = Tally() if waits else None
+        # Request times of _waiters, in step with it (only if waits=True).
+        self._arrivals: deque = deque()
 
     @property
     def count(self) -> int:
         """Number of slots currently in use."""
         return self._count
 
+    @property
+    def monitor(self) -> TimeWeighted | None:
+        """Time-weighted statistics of `count`, or None if not monitored."""
+        return self._monitor
+
+    @property
+    def waits(self) -> Tally | None:
+        """Statistics of the time waited for a slot, or None if not tallied."""
+        return self._waits
+
     # ------------------------------------------------------------------
     # Blocking acquire (returns Event)
     # ------------------------------------------------------------------
@@ -32,14 +57,20 @@ class Resource:
         """Return an Event that resolves to None when a slot is available."""
         if self._count < self.capacity:
             self._count += 1
+            if self._monitor is not None:
+                self._monitor.record(self._count)
+            if self._waits is not None:
+                self._waits.add(0)
             evt = Event(self._env)
             # _on_cancel restores the slot if FirstOf later discards this event.
-            evt._on_cancel = lambda v: self.release()
+            evt._on_cancel = self._undo_acquire
             evt.succeed()
             return evt
 
         evt = Event(self._env)
         self._waiters.append(evt)
+        if self._waits is not None:
+            self._arrivals.append(self._env._now)
         return evt
 
     # ------------------------------------------------------------------
@@ -50,6 +81,8 @@ class Resource:
         """Acquire a slot if one is free.  Returns True on success, False otherwise."""
         if self._count < self.capacity:
             self._count += 1
+            if self._monitor is not None:
+                self._monitor.record(self._count)
             return True
         return False
 
@@ -61,14 +94,24 @@ class Resource:
         """Release one slot and wake the next waiting process (lazy deletion)."""
         self._count -= 1
         while self._waiters:
-            evt = self._waiters[0]
+            evt = self._waiters.popleft()
+            if self._waits is not None:
+                arrived = self._arrivals.popleft()
             if evt._value is _CANCELLED:
-                self._waiters.popleft()
                 continue
-            self._waiters.popleft()
             self._count += 1
+            if self._waits is not None:
+                self._waits.add(self._env._now - arrived)
             evt.succeed()
             break
+        if self._monitor is not None:
+            self._monitor.record(self._count)
+
+    def _undo_acquire(self, _value: object) -> None:
+        """Give back a slot whose pre-triggered acquire event was cancelled."""
+        if self._waits is not None:
+            self._waits._discard(0)
+        self.release()
 
     # ------------------------------------------------------------------
     # Async context manager
@@ -0,0 +1,234 @@
+"""Pluggable destinations for Environment.log() records."""
+
+from abc import ABC, abstractmethod
+from array import array
+import csv
+from collections import deque
+import os
+from typing import IO, Any, Callable
+
+# Log records are (time, name, message) tuples.
+Record = tuple[float | int, str, str]
+
+
+class Sink(ABC):
+    """Abstract destination for log records.
+
+    Environment passes every record to write(); get_log() returns
+    records().  Sinks that do not keep records in memory return an empty
+    list.  Sinks that hold an external resource release it in close(),
+    and can be used as context managers.
+    """
+
+    @abstractmethod
+    def write(self, time: float | int, name: str, message: str) -> None:
+        """Accept one record."""
+
+    def records(self) -> list[Record]:
+        """Return the records still held in memory."""
+        return []
+
+    def close(self) -> None:
+        """Flush anything buffered and release resources."""
+
+    def __enter__(self) -> "Sink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class ListSink(Sink):
+    """Keep every record in a list (the default; memory grows without bound)."""
+
+    def __init__(self):
+        self._records: list[Record] = []
+
+    def write(self, time: float | int, name: str, message: str) -> None:
+        self._records.append((time, name, message))
+
+    def records(self) -> list[Record]:
+        return self._records
+
+
+class RingSink(Sink):
+    """Keep only the most recent `size` records."""
+
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError(f"size must be positive, got {size}")
+        self._records: deque = deque(maxlen=size)
+
+    def write(self, time: float | int, name: str, message: str) -> None:
+        self._records.append((time, name, message))
+
+    def records(self) -> list[Record]:
+        return list(self._records)
+
+
+class NullSink(Sink):
+    """Discard every record."""
+
+    def write(self, time: float | int, name: str, message: str) -> None:
+        pass
+
+
+class CallbackSink(Sink):
+    """Call `func(time, name, message)` for every record."""
+
+    def __init__(self, func: Callable[[float | int, str, str], Any]):
+        self._func = func
+
+    def write(self, time: float | int, name: str, message: str) -> None:
+        self._func(time, name, message)
+
+
+class CSVSink(Sink):
+    """Write records as CSV rows, `batch_size` rows at a time.
+
+    `file` is either a path, which is opened (and truncated) here and
+    closed by close(), or an open text file, which is left open.  Rows are
+    buffered in memory and handed to csv.writer.writerows() whenever
+    `batch_size` of them have accumulated, and by flush() and close().
+    With header=True the first row is "time,name,message".
+    """
+
+    def __init__(
+        self,
+        file: str | os.PathLike | IO[str],
+        batch_size: int = 1024,
+        header: bool = True,
+    ):
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+        if isinstance(file, (str, os.PathLike)):
+            self._file: IO[str] = open(file, "w", newline="")
+            self._owned = True
+        else:
+            self._file = file
+            self._owned = False
+        self._writer = csv.writer(self._file)
+        self._batch_size = batch_size
+        self._buffer: list[Record] = []
+        if header:
+            self._writer.writerow(("time", "name", "message"))
+
+    def write(self, time: float | int, name: str, message: str) -> None:
+        self._buffer.append((time, name, message))
+        if len(self._buffer) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out buffered rows."""
+        if self._buffer:
+            self._writer.writerows(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        if self._owned:
+            self._file.close()
+
+
+class ColumnarSink(Sink):
+    """Keep records in typed columns, with names and messages interned.
+
+    Times go in an array('d') and each name and message is replaced by an
+    integer code in an array('i'); the distinct strings are kept once each,
+    in order of first appearance, in `names` and `messages`.  A record
+    therefore costs 16 bytes plus the first copy of any new string,
+    instead of a tuple, a boxed float and two string references.
+
+    columns() returns memoryviews of the three arrays, and to_numpy() and
+    to_arrow() wrap the same memory without copying it row by row (the
+    message and name columns are dictionary-encoded, so polars.from_arrow()
+    turns them into categoricals).  numpy and pyarrow are imported only
+    when those methods are called.
+
+    While any exported view is alive the arrays cannot grow, so further
+    write() calls raise BufferError: export after the run, or drop the
+    views before logging more.
+    """
+
+    def __init__(self):
+        self._times = array("d")
+        self._name_codes = array("i")
+        self._message_codes = array("i")
+        # String -> code; insertion order is code order.
+        self._names: dict[str, int] = {}
+        self._messages: dict[str, int] = {}
+
+    def write(self, time: float | int, name: str, message: str) -> None:
+        self._times.append(time)
+        names = self._names
+        self._name_codes.append(names.setdefault(name, len(names)))
+        messages = self._messages
+        self._message_codes.append(messages.setdefault(message, len(messages)))
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    @property
+    def names(self) -> list[str]:
+        """Distinct names, indexed by code."""
+        return list(self._names)
+
+    @property
+    def messages(self) -> list[str]:
+        """Distinct messages, indexed by code."""
+        return list(self._messages)
+
+    def records(self) -> list[Record]:
+        names = self.names
+        messages = self.messages
+        return [
+            (time, names[n], messages[m])
+            for time, n, m in zip(self._times, self._name_codes, self._message_codes)
+        ]
+
+    def columns(self) -> dict[str, memoryview]:
+        """Return memoryviews of the time, name-code and message-code columns."""
+        return {
+            "time": memoryview(self._times),
+            "name": memoryview(self._name_codes),
+            "message": memoryview(self._message_codes),
+        }
+
+    def to_numpy(self) -> dict:
+        """Return the columns as numpy arrays sharing this sink's memory.
+
+        "time" is float64 and "name"/"message" hold codes into
+        `names`/`messages`.
+        """
+        import numpy as np
+
+        return {key: np.asarray(view) for key, view in self.columns().items()}
+
+    def to_arrow(self):
+        """Return a pyarrow Table whose buffers are this sink's arrays.
+
+        "name" and "message" are dictionary arrays over `names` and
+        `messages`; only those distinct strings are copied.
+        """
+        import pyarrow as pa
+
+        num = len(self)
+        codes = pa.int32() if self._name_codes.itemsize == 4 else pa.int64()
+
+        def column(values, kind):
+            return pa.Array.from_buffers(kind, num, [None, pa.py_buffer(values)])
+
+        return pa.table(
+            {
+                "time": column(self._times, pa.float64()),
+                "name": pa.DictionaryArray.from_arrays(
+                    column(self._name_codes, codes), pa.array(self.names)
+                ),
+                "message": pa.DictionaryArray.from_arrays(
+                    column(self._message_codes, codes), pa.array(self.messages)
+                ),
+            }
+        )
@@ -0,0 +1,68 @@
+"""Lightweight delay that a process awaits directly."""
+
+from typing import TYPE_CHECKING
+
+from .event import _PENDING
+from .timeout import _NO_TIME
+
+if TYPE_CHECKING:
+    from .environment import Environment
+    from .process import _Driver
+
+
+class Sleep:
+    """Awaitable that suspends the awaiting process for `delay` time units.
+
+    Unlike Timeout, Sleep is not an Event: it has no waiter list and never
+    calls Process.resume().  When a process awaits it, Process._loop puts
+    the Sleep's _fire method straight into the scheduler, and _fire drives
+    the process's coroutine when the time comes.  Use it for plain delays:
+
+        await env.sleep(5)
+
+    Because it is not an Event, a Sleep cannot be passed to FirstOf or
+    AllOf; use Timeout there.  Interrupting a sleeping process cancels the
+    Sleep, which leaves a dead scheduler entry just as a cancelled Timeout
+    does.
+
+    A Sleep wakes only the one process awaiting it: awaiting it from a
+    second process while the first is still asleep raises RuntimeError.
+    """
+
+    __slots__ = ("_env", "_delay", "_process")
+
+    # Read by the tight-loop check in Process._loop.  A Sleep is never
+    # pre-triggered, so the class attribute is enough.
+    _value = _PENDING
+
+    def __init__(self, env: "Environment", delay: float | int):
+        if delay < 0:
+            raise ValueError(f"delay must be non-negative, got {delay}")
+        self._env = env
+        self._delay = delay
+        self._process: "_Driver | None" = None
+
+    def _park(self, process: "_Driver") -> None:
+        """Schedule `process` to continue after the delay."""
+        if self._process is not None:
+            raise RuntimeError("a Sleep can only be awaited by one process at a time")
+        self._process = process
+        env = self._env
+        env.schedule(env._now + self._delay, self._fire)
+
+    def cancel(self) -> None:
+        """Stop the pending wakeup (called when the process is interrupted)."""
+        if self._process is not None:
+            self._process = None
+            self._env._discard()
+
+    def _fire(self):
+        """Continue the sleeping process, or signal a phantom entry if cancelled."""
+        process = self._process
+        if process is None:
+            return _NO_TIME
+        self._process = None
+        process._loop()
+
+    def __await__(self):
+        yield self
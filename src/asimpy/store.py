@@ -1,7 +1,10 @@
-"""Store of heterogeneous objects with optional filter on get."""
+"""Store of heterogeneous objects with optional filter or key on get."""
 
+from collections import deque
+import itertools
 from typing import Any, Callable
-from .event import _CANCELLED, Event
+from .event import _CANCELLED, _PENDING, Event
+from .monitor import TimeWeighted
 
 
 class StoreEmpty(Exception):
@@ -20,20 +23,45 @@ class Store:
     and returned.  If no matching item is available, the process blocks.
 
     Blocking put() blocks only if the store is at capacity.
+
+    Waiting getters are kept in a deque of (filter, Event) pairs.  A getter
+    that is cancelled, or served from the middle of the deque by a filter
+    match, stays in place as a dead entry: dead entries at the front are
+    popped by the next put, and the deque is rebuilt once dead entries
+    outnumber live ones, so a put never scans more than twice the number
+    of live getters.  Waiting putters are served strictly oldest first, so
+    cancelled ones are simply skipped, as in Queue.
+
+    With monitor=True, `monitor` is a TimeWeighted that tracks len(store).
     """
 
-    def __init__(self, env, capacity: int | float = float("inf")):
+    # Never rebuild the getter deque with fewer dead entries than this.
+    _COMPACT_MIN = 64
+
+    def __init__(
+        self,
+        env,
+        capacity: int | float = float("inf"),
+        monitor: bool = False,
+    ):
         if capacity <= 0:
             raise ValueError(f"capacity must be positive, got {capacity}")
         self._env = env
         self._capacity = capacity
         self._items: list = []
-        self._getters: list = []  # Each getter entry: [filter_fn_or_None, Event]
-        self._putters: list = []  # Each putter entry: [item, Event]
+        self._getters: deque = deque()  # (filter or None, Event) pairs
+        self._dead = 0  # entries in _getters whose Event is no longer pending
+        self._putters: deque = deque()  # (item, Event) pairs
+        self._monitor = TimeWeighted(env) if monitor else None
 
     def __len__(self) -> int:
         return len(self._items)
 
+    @property
+    def monitor(self) -> TimeWeighted | None:
+        """Time-weighted statistics of len(store), or None if not monitored."""
+        return self._monitor
+
     # ------------------------------------------------------------------
     # Blocking operations (return Event)
     # ------------------------------------------------------------------
@@ -48,13 +76,16 @@ class Store:
             if filter is None or filter(item):
                 self._items.pop(i)
                 self._promote_putter()
+                if self._monitor is not None:
+                    self._monitor.record(len(self._items))
                 evt = Event(self._env)
-                evt._on_cancel = lambda v: self._items.append(v)
+                evt._on_cancel = self._put_back
                 evt.succeed(item)
                 return evt
 
         evt = Event(self._env)
-        self._getters.append([filter, evt])
+        evt._on_cancel = self._getter_died
+        self._getters.append((filter, evt))
         return evt
 
     def put(self, item: Any) -> Event:
@@ -63,30 +94,35 @@ class Store:
         Delivers directly to a matching waiting getter if one exists,
         adds to items if there is capacity, or blocks.
         """
-        # Deliver directly to the first non-cancelled getter whose filter matches.
-        i = 0
-        while i < len(self._getters):
-            filt, getter = self._getters[i]
-            if getter._value is _CANCELLED:
-                self._getters.pop(i)
-                continue
-            if filt is None or filt(item):
-                self._getters.pop(i)
-                getter._on_cancel = lambda v: self._items.append(v)
-                getter.succeed(item)
-                result = Event(self._env)
-                result.succeed(True)
-                return result
-            i += 1
+        # Deliver directly to the oldest live getter whose filter matches.
+        getters = self._getters
+        while getters and getters[0][1]._value is not _PENDING:
+            getters.popleft()
+            self._dead -= 1
+        for filt, getter in getters:
+            if getter._value is _PENDING and (filt is None or filt(item)):
+                break
+        else:
+            getter = None
+        if getter is not None:
+            at_front = getters[0][1] is getter
+            if at_front:
+                getters.popleft()
+            getter._on_cancel = self._put_back
+            getter.succeed(item)
+            if not at_front:
+                # Counted only now, so a rebuild drops it.
+                self._getter_died()
+            return self._env._put_done
 
         if len(self._items) < self._capacity:
             self._items.append(item)
-            result = Event(self._env)
-            result.succeed(True)
-            return result
+            if self._monitor is not None:
+                self._monitor.record(len(self._items))
+            return self._env._put_done
 
         evt = Event(self._env)
-        self._putters.append([item, evt])
+        self._putters.append((item, evt))
         return evt
 
     # ------------------------------------------------------------------
@@ -97,7 +133,10 @@ class Store:
         """Remove and return the first matching item, or raise StoreEmpty."""
         for i, item in enumerate(self._items):
             if filter is None or filter(item):
-                return self._items.pop(i)
+                self._items.pop(i)
+                if self._monitor is not None:
+                    self._monitor.record(len(self._items))
+                return item
         raise StoreEmpty("no matching item available")
 
     def try_put(self, item: Any) -> None:
@@ -105,6 +144,8 @@ class Store:
         if len(self._items) >= self._capacity:
             raise StoreFull("store is at capacity")
         self._items.append(item)
+        if self._monitor is not None:
+            self._monitor.record(len(self._items))
 
     # ------------------------------------------------------------------
     # Internal
@@ -112,13 +153,274 @@ class Store:
 
     def _promote_putter(self) -> None:
         """Move one waiting putter's item into the store (lazy deletion)."""
-        i = 0
-        while i < len(self._putters):
-            item, evt = self._putters[i]
+        putters = self._putters
+        while putters:
+            item, evt = putters.popleft()
             if evt._value is _CANCELLED:
-                self._putters.pop(i)
                 continue
-            self._putters.pop(i)
             self._items.append(item)
             evt.succeed(True)
             break
+
+    def _put_back(self, item: Any) -> None:
+        """Return the item of a get that FirstOf discarded."""
+        self._items.append(item)
+        if self._monitor is not None:
+            self._monitor.record(len(self._items))
+
+    def _getter_died(self, _value: Any = None) -> None:
+        """Count a dead getter entry; rebuild the deque if they dominate."""
+        self._dead += 1
+        if self._dead >= self._COMPACT_MIN and 2 * self._dead > len(self._getters):
+            self._getters = deque(
+                entry for entry in self._getters if entry[1]._value is _PENDING
+            )
+            self._dead = 0
+
+
+# Default for KeyedStore.get(): take an item with any key.
+_ANY = object()
+
+# Returned by KeyedStore._take() when no matching item is stored.
+_MISSING = object()
+
+
+class KeyedStore:
+    """A Store whose items and waiting getters are indexed by `key(item)`.
+
+    get(k) removes the oldest item whose key is k, and put(item) hands the
+    item to the oldest process waiting for key(item), without scanning other
+    items or calling a filter for each one: both are O(1).  get() with no
+    key removes the oldest item of any key, as Store.get() does with no
+    filter.
+
+    Items are kept in a deque per key, plus one deque of every item in
+    arrival order for get() with no key.  An item taken by key is only
+    marked stale in the arrival-order deque, which is rebuilt once stale
+    entries outnumber live ones.  Getters are kept in a deque per key, plus
+    one for getters of any key.  Cancelled getters are counted and skipped
+    when they reach the front, and a deque is rebuilt once they make up
+    most of it, as in Queue.
+
+    The key function is evaluated once per put.  Cancellation and capacity
+    behave as in Store: a cancelled pre-triggered get puts its item back at
+    the end of its key's queue.
+    """
+
+    # Never rebuild a deque with fewer stale or cancelled entries than this.
+    _COMPACT_MIN = 64
+
+    def __init__(
+        self,
+        env,
+        key: Callable[[Any], Any],
+        capacity: int | float = float("inf"),
+    ):
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self._env = env
+        self._key = key
+        self._capacity = capacity
+        self._size = 0
+        # key -> deque of [item, key, live] entries, oldest first.
+        self._items: dict = {}
+        # Every entry in arrival order; entries taken by key have live False.
+        self._order: deque = deque()
+        self._stale = 0
+        # key -> deque of (seq, Event); seq orders them against _any_getters.
+        self._getters: dict = {}
+        self._any_getters: deque = deque()
+        # key -> number of cancelled entries in _getters[key] (absent if 0).
+        self._dead_getters: dict = {}
+        self._dead_any_getters = 0
+        self._seq = itertools.count()
+        self._putters: deque = deque()  # (item, Event) pairs
+
+    def __len__(self) -> int:
+        return self._size
+
+    # ------------------------------------------------------------------
+    # Blocking operations (return Event)
+    # ------------------------------------------------------------------
+
+    def get(self, key: Any = _ANY) -> Event:
+        """Return an Event whose value is the oldest item with this key.
+
+        With no key, the oldest item of any key.  If a matching item is
+        already available, the Event is pre-triggered and _on_cancel is set
+        so that FirstOf can restore the item.
+        """
+        item = self._take(key)
+        if item is not _MISSING:
+            self._promote_putter()
+            evt = Event(self._env)
+            evt._on_cancel = self._add
+            evt.succeed(item)
+            return evt
+
+        evt = Event(self._env)
+        evt._on_cancel = lambda _v, k=key: self._getter_died(k)
+        if key is _ANY:
+            self._any_getters.append((next(self._seq), evt))
+        else:
+            getters = self._getters.get(key)
+            if getters is None:
+                getters = self._getters[key] = deque()
+            getters.append((next(self._seq), evt))
+        return evt
+
+    def put(self, item: Any) -> Event:
+        """Return an Event that resolves to True when `item` is stored.
+
+        Delivers directly to the oldest getter waiting for key(item) (or
+        for any key), adds to items if there is capacity, or blocks.
+        """
+        k = self._key(item)
+        getter = self._pop_getter(k)
+        if getter is not None:
+            getter._on_cancel = self._add
+            getter.succeed(item)
+            return self._env._put_done
+
+        if self._size < self._capacity:
+            self._add(item, k)
+            return self._env._put_done
+
+        evt = Event(self._env)
+        self._putters.append((item, evt))
+        return evt
+
+    # ------------------------------------------------------------------
+    # Non-blocking operations (raise on failure)
+    # ------------------------------------------------------------------
+
+    def try_get(self, key: Any = _ANY) -> Any:
+        """Remove and return the oldest item with this key, or raise StoreEmpty."""
+        item = self._take(key)
+        if item is _MISSING:
+            raise StoreEmpty("no matching item available")
+        return item
+
+    def try_put(self, item: Any) -> None:
+        """Add `item` to the store, or raise StoreFull."""
+        if self._size >= self._capacity:
+            raise StoreFull("store is at capacity")
+        self._add(item)
+
+    # ------------------------------------------------------------------
+    # Internal
+    # ------------------------------------------------------------------
+
+    def _add(self, item: Any, k: Any = _MISSING) -> None:
+        """Append `item` to its key's queue and to the arrival order."""
+        if k is _MISSING:
+            k = self._key(item)
+        entry = [item, k, True]
+        items = self._items.get(k)
+        if items is None:
+            items = self._items[k] = deque()
+        items.append(entry)
+        self._order.append(entry)
+        self._size += 1
+
+    def _take(self, key: Any) -> Any:
+        """Remove and return the oldest item with `key`, or _MISSING."""
+        if key is _ANY:
+            order = self._order
+            while order:
+                entry = order.popleft()
+                if entry[2]:
+                    break
+                self._stale -= 1
+            else:
+                return _MISSING
+            # The oldest item overall is also the oldest of its key.
+            k = entry[1]
+            items = self._items[k]
+            items.popleft()
+        else:
+            k = key
+            items = self._items.get(k)
+            if items is None:
+                return _MISSING
+            entry = items.popleft()
+            entry[2] = False
+            self._stale += 1
+            if self._stale >= self._COMPACT_MIN and self._stale > self._size:
+                self._order = deque(e for e in self._order if e[2])
+                self._stale = 0
+        if not items:
+            del self._items[k]
+        self._size -= 1
+        return entry[0]
+
+    def _pop_getter(self, k: Any) -> Event | None:
+        """Remove and return the oldest live getter for key `k`, or None."""
+        getters = self._getters.get(k)
+        if getters is not None:
+            if k in self._dead_getters:
+                while getters and getters[0][1]._value is _CANCELLED:
+                    getters.popleft()
+                    self._dead_getters[k] -= 1
+                if not self._dead_getters[k]:
+                    del self._dead_getters[k]
+            if not getters:
+                del self._getters[k]
+                getters = None
+        any_getters = self._any_getters
+        while any_getters and any_getters[0][1]._value is _CANCELLED:
+            any_getters.popleft()
+            self._dead_any_getters -= 1
+        if getters is None:
+            return any_getters.popleft()[1] if any_getters else None
+        if any_getters and any_getters[0][0] < getters[0][0]:
+            return any_getters.popleft()[1]
+        evt = getters.popleft()[1]
+        if not getters:
+            del self._getters[k]
+        return evt
+
+    def _getter_died(self, key: Any) -> None:
+        """Count a cancelled getter for `key`; rebuild its deque if they dominate."""
+        if key is _ANY:
+            self._dead_any_getters += 1
+            dead = self._dead_any_getters
+            if dead >= self._COMPACT_MIN and 2 * dead > len(self._any_getters):
+                self._any_getters = deque(
+                    e for e in self._any_getters if e[1]._value is _PENDING
+                )
+                self._dead_any_getters = 0
+            return
+        dead = self._dead_getters.get(key, 0) + 1
+        getters = self._getters[key]
+        if dead >= self._COMPACT_MIN and 2 * dead > len(getters):
+            getters = deque(e for e in getters if e[1]._value is _PENDING)
+            if getters:
+                self._getters[key] = getters
+            else:
+                del self._getters[key]
+            dead = 0
+        if dead:
+            self._dead_getters[key] = dead
+        else:
+            self._dead_getters.pop(key, None)
+
+    def _promote_putter(self) -> None:
+        """Move one waiting putter's item into the store (lazy deletion).
+
+        The item goes straight to a waiting getter for its key if there is
+        one, so it cannot sit in the store while that getter waits.
+        """
+        while self._putters:
+            item, evt = self._putters.popleft()
+            if evt._value is _CANCELLED:
+                continue
+            k = self._key(item)
+            getter = self._pop_getter(k)
+            if getter is not None:
+                getter._on_cancel = self._add
+                getter.succeed(item)
+            else:
+                self._add(item, k)
+            evt.succeed(True)
+            break
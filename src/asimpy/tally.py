@@ -0,0 +1,208 @@
+"""Constant-memory statistics of a stream of observations."""
+
+import math
+from typing import Union
+
+Amount = Union[int, float]
+
+
+class Tally:
+    """Count, mean, variance, extremes and quantiles of observed values.
+
+    Use a Tally instead of appending every wait or sojourn time to a list:
+
+        waits = Tally()
+        waits.add(env.now - arrival)
+        ...
+        print(waits.mean, waits.quantile(0.95))
+
+    The mean and variance are kept with Welford's update, so they are
+    exact (up to rounding) and need O(1) memory.  Quantiles come from a
+    log-bucketed sketch (as in DDSketch): each value is counted in the
+    bucket ceil(log_gamma(|x|)) with gamma = (1 + accuracy) / (1 - accuracy),
+    so quantile() is within a relative error of `accuracy` of a value in
+    the data, and memory grows only with the logarithm of the range of
+    magnitudes (about 700 buckets per factor of 10**6 at the default 1%).
+
+    Two tallies with the same accuracy can be merged, e.g. to combine
+    replications run in parallel.
+    """
+
+    __slots__ = (
+        "_accuracy",
+        "_log_gamma",
+        "_count",
+        "_mean",
+        "_m2",
+        "_min",
+        "_max",
+        "_zeros",
+        "_pos",
+        "_neg",
+    )
+
+    def __init__(self, accuracy: float = 0.01):
+        if not 0 < accuracy < 1:
+            raise ValueError(f"accuracy must be in (0, 1), got {accuracy}")
+        self._accuracy = accuracy
+        self._log_gamma = math.log((1 + accuracy) / (1 - accuracy))
+        self._reset()
+
+    def _reset(self) -> None:
+        """Forget every observation."""
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+        self._zeros = 0
+        # Bucket index -> count, for positive and for negative values.
+        self._pos: dict = {}
+        self._neg: dict = {}
+
+    def add(self, value: Amount) -> None:
+        """Record one observation."""
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+        if value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+        if value > 0:
+            k = math.ceil(math.log(value) / self._log_gamma)
+            self._pos[k] = self._pos.get(k, 0) + 1
+        elif value < 0:
+            k = math.ceil(math.log(-value) / self._log_gamma)
+            self._neg[k] = self._neg.get(k, 0) + 1
+        else:
+            self._zeros += 1
+
+    def _discard(self, value: Amount) -> None:
+        """Undo an earlier add(value), e.g. for a request that was cancelled.
+
+        count, mean, variance and quantiles are restored exactly.  If no
+        other observation can equal a discarded minimum or maximum, the new
+        extreme is read from the sketch, so it is only within `accuracy`.
+        """
+        count = self._count - 1
+        if not count:
+            self._reset()
+            return
+        mean = (self._count * self._mean - value) / count
+        self._m2 -= (value - mean) * (value - self._mean)
+        self._mean = mean
+        self._count = count
+        if value:
+            buckets = self._pos if value > 0 else self._neg
+            k = math.ceil(math.log(abs(value)) / self._log_gamma)
+            buckets[k] -= 1
+            if not buckets[k]:
+                del buckets[k]
+                if value == self._min:
+                    self._min = self._sketch_min()
+                if value == self._max:
+                    self._max = self._sketch_max()
+        else:
+            self._zeros -= 1
+            if not self._zeros:
+                if self._min == 0:
+                    self._min = self._sketch_min()
+                if self._max == 0:
+                    self._max = self._sketch_max()
+
+    def merge(self, other: "Tally") -> None:
+        """Fold the observations of `other` into this tally."""
+        if other._accuracy != self._accuracy:
+            raise ValueError("can only merge tallies with the same accuracy")
+        if not other._count:
+            return
+        count = self._count + other._count
+        delta = other._mean - self._mean
+        self._mean += delta * other._count / count
+        self._m2 += other._m2 + delta * delta * self._count * other._count / count
+        self._count = count
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        self._zeros += other._zeros
+        for mine, theirs in ((self._pos, other._pos), (self._neg, other._neg)):
+            for k, n in theirs.items():
+                mine[k] = mine.get(k, 0) + n
+
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return self._count
+
+    @property
+    def mean(self) -> float:
+        """Mean of the observations (nan if there are none)."""
+        return self._mean if self._count else math.nan
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (nan with fewer than two observations)."""
+        return self._m2 / (self._count - 1) if self._count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+    @property
+    def min(self) -> float:
+        """Smallest observation (inf if there are none)."""
+        return self._min
+
+    @property
+    def max(self) -> float:
+        """Largest observation (-inf if there are none)."""
+        return self._max
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile, 0 <= q <= 1 (nan if there are no observations)."""
+        if not 0 <= q <= 1:
+            raise ValueError(f"q must be in [0, 1], got {q}")
+        if not self._count:
+            return math.nan
+        if q == 1:
+            return self._max
+        rank = q * (self._count - 1)
+        seen = 0
+        for k in sorted(self._neg, reverse=True):
+            seen += self._neg[k]
+            if seen > rank:
+                return max(-self._value(k), self._min)
+        seen += self._zeros
+        if seen > rank:
+            return 0.0
+        for k in sorted(self._pos):
+            seen += self._pos[k]
+            if seen > rank:
+                return min(self._value(k), self._max)
+        return self._max
+
+    def _sketch_min(self) -> float:
+        """Smallest value in the sketch (within `accuracy`)."""
+        if self._neg:
+            return -self._value(max(self._neg))
+        if self._zeros:
+            return 0
+        return self._value(min(self._pos))
+
+    def _sketch_max(self) -> float:
+        """Largest value in the sketch (within `accuracy`)."""
+        if self._pos:
+            return self._value(max(self._pos))
+        if self._zeros:
+            return 0
+        return -self._value(min(self._neg))
+
+    def _value(self, k: int) -> float:
+        """Representative magnitude of bucket k (within `accuracy` of its contents)."""
+        gamma = math.exp(self._log_gamma)
+        return 2 * gamma**k / (gamma + 1)
+
+    def __repr__(self) -> str:
+        return f"Tally(count={self._count}, mean={self.mean:.6g})"
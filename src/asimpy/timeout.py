@@ -18,6 +18,17 @@ class Timeout(Event):
         super().__init__(env)
         env.schedule(env.now + delay, self._fire)
 
+    def cancel(self) -> None:
+        """Cancel the timeout.
+
+        A pending timeout still has an entry in the environment's scheduler;
+        tell the environment that entry is now dead so it can compact.
+        """
+        pending = self._value is _PENDING
+        Event.cancel(self)
+        if pending:
+            self._env._discard()
+
     def _fire(self):
         """Trigger the timeout, or signal a phantom entry if cancelled."""
         if self._value is _CANCELLED:
@@ -51,5 +51,5 @@ def test_allof_requires_at_least_one_event():
 def test_allof_rejects_non_event_argument():
     """AllOf raises TypeError when an argument is not an Event."""
     env = Environment()
-    with pytest.raises(TypeError, match="must be an Event"):
+    with pytest.raises(TypeError, match="must be an Event or process"):
         AllOf(env, a=42)
@@ -1,7 +1,16 @@
 """Test asimpy Container."""
 
+import random
+
 import pytest
-from asimpy import Container, ContainerEmpty, ContainerFull, Environment, FirstOf, Process
+from asimpy import (
+    Container,
+    ContainerEmpty,
+    ContainerFull,
+    Environment,
+    FirstOf,
+    Process,
+)
 
 
 def test_container_default_init():
@@ -228,7 +237,7 @@ def test_container_get_skips_cancelled_getter():
 
     # Both getters are parked; cancel g1's event.
     env.run(until=0)
-    c._getters[0][1].cancel()
+    c._getters._buckets[3][0][1].cancel()
 
     # Put enough to satisfy g2 only — g1 is cancelled.
     class Putter(Process):
@@ -263,7 +272,7 @@ def test_container_put_skips_cancelled_putter():
     p2 = BlockedPutter(env, c, 2)
 
     env.run(until=0)  # let both putters park
-    c._putters[0][1].cancel()  # cancel p1's event
+    c._putters._buckets[2][0][1].cancel()  # cancel p1's event
 
     class Getter(Process):
         def init(self, c):
@@ -280,6 +289,7 @@ def test_container_put_skips_cancelled_putter():
 
 def test_container_firstof_item_wins():
     """When a pre-triggered get event wins FirstOf, the level stays reduced."""
+
     class Racer(Process):
         def init(self, c):
             self.c = c
@@ -398,3 +408,206 @@ def test_container_trigger_putters_skips_oversized():
 
     assert sp.done
     assert lp.done
+
+
+def test_container_immediate_put_event_ignores_cancel():
+    """A put that succeeds immediately carries its amount and cannot be undone."""
+    env = Environment()
+    c = Container(env, capacity=10)
+    evt = c.put(3)
+    assert evt.triggered and evt._value == 3
+    evt.cancel()
+    assert evt.triggered
+    assert c.level == 3
+
+
+def test_container_cancelled_waiters_leave_immediately():
+    """Waiters cancelled by FirstOf timeouts are removed, and order is kept."""
+    env = Environment()
+    c = Container(env, capacity=10)
+    served = []
+
+    async def getter(name, patience):
+        if patience is None:
+            served.append((name, await c.get(1)))
+        else:
+            await FirstOf(env, got=c.get(1), late=env.timeout(patience))
+
+    for i in range(100):
+        env.process(getter(i, None if i % 10 == 0 else 1))
+    env.run(until=2)
+    assert len(c._getters) == 10
+    c.put(5)
+    env.run()
+    assert [name for name, _ in served] == [0, 10, 20, 30, 40]
+    assert len(c._getters) == 5
+
+
+def test_container_firstof_two_gets_served_by_one_put():
+    """One put serving both gets in a FirstOf restores the loser's amount."""
+    env = Environment()
+    c = Container(env, capacity=10)
+    results = []
+
+    async def picker():
+        results.append(await FirstOf(env, a=c.get(2), b=c.get(3)))
+
+    env.process(picker())
+    env.run(until=0)
+    c.put(5)
+    env.run()
+    assert results == [("a", 2)]
+    assert c.level == 3
+    assert not c._getters
+
+
+def test_container_rejects_unknown_policy():
+    env = Environment()
+    with pytest.raises(ValueError, match="policy must be one of"):
+        Container(env, policy="largest_first")
+
+
+def _serve_order(policy, amounts, puts):
+    """Block one getter per amount, then make each put in turn."""
+    env = Environment()
+    c = Container(env, policy=policy)
+    served = []
+
+    async def getter(name, amount):
+        await c.get(amount)
+        served.append(name)
+
+    for name, amount in enumerate(amounts):
+        env.process(getter(name, amount))
+    env.run()
+    for amount in puts:
+        c.put(amount)
+        env.run()
+    return served
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [
+        ("fifo", [0, 1, 2]),
+        ("first_fit", [1, 2, 0]),
+        ("smallest_first", [2, 1, 0]),
+    ],
+)
+def test_container_policy_serve_order(policy, expected):
+    """Each policy picks blocked getters in its own order."""
+    served = _serve_order(policy, [3, 2, 1], [2, 2, 2])
+    assert served == expected
+
+
+def test_container_fifo_new_get_waits_behind_blocked_one():
+    """Under fifo a get that would fit still queues behind a blocked get."""
+    env = Environment()
+    c = Container(env, init=2, policy="fifo")
+    big = c.get(5)
+    small = c.get(1)
+    assert not small.triggered
+    c.put(4)
+    assert big.triggered and small.triggered
+    assert c.level == 0
+
+
+def test_container_fifo_cancelled_head_releases_queue():
+    """Under fifo, cancelling the blocked head serves the requests behind it."""
+    env = Environment()
+    c = Container(env, init=5, policy="fifo")
+    served = []
+
+    async def impatient():
+        await FirstOf(env, got=c.get(10), t=env.timeout(1))
+
+    async def patient():
+        await env.timeout(0.5)
+        served.append((await c.get(3), env.now))
+        served.append((await c.get(1), env.now))
+
+    env.process(impatient())
+    env.process(patient())
+    env.run()
+    assert served == [(3, 1), (1, 1)]
+    assert c.level == 1
+
+
+def test_container_fifo_cancelled_head_putter_releases_queue():
+    """Under fifo, cancelling a blocked put lets the puts behind it in."""
+    env = Environment()
+    c = Container(env, capacity=10, init=5, policy="fifo", monitor=True)
+    big = c.put(8)
+    small = c.put(2)
+    assert not small.triggered
+    big.cancel()
+    assert small.triggered
+    assert c.level == 7
+    assert c.monitor.value == 7
+
+
+def test_container_smallest_first_putters():
+    """Blocked putters are served by the same policy, using free space."""
+    env = Environment()
+    c = Container(env, capacity=10, init=10, policy="smallest_first")
+    large = c.put(5)
+    small = c.put(2)
+    c.try_get(3)
+    c.get(1)
+    assert small.triggered and not large.triggered
+    assert c.level == 8
+
+
+def test_container_first_fit_matches_linear_scan():
+    """Random gets, puts and cancellations agree with a first-fit list scan."""
+    rng = random.Random(4321)
+    env = Environment()
+    c = Container(env)
+    pending = []  # reference: [amount, Event] in arrival order
+    level = 0
+    for _ in range(2000):
+        op = rng.random()
+        if op < 0.5:
+            amount = rng.randint(1, 8)
+            evt = c.get(amount)
+            if level >= amount and not evt.cancelled:
+                level -= amount
+            else:
+                pending.append([amount, evt])
+        elif op < 0.6 and pending:
+            entry = pending.pop(rng.randrange(len(pending)))
+            entry[1].cancel()
+        else:
+            c.put(rng.randint(1, 5))
+            level = c.level + sum(a for a, e in pending if e.triggered)
+            for entry in list(pending):
+                amount, evt = entry
+                if level >= amount:
+                    assert evt.triggered
+                    level -= amount
+                    pending.remove(entry)
+                else:
+                    assert not evt.triggered
+        assert c.level == level
+        assert len(c._getters) == len(pending)
+
+
+def test_container_getters_served_out_of_order_are_compacted():
+    """Getters served from behind the front do not accumulate."""
+    env = Environment()
+    c = Container(env)
+    served = []
+
+    async def getter(amount):
+        served.append(await c.get(amount))
+
+    env.process(getter(10**6))
+    for _ in range(1000):
+        env.process(getter(1))
+    env.run()
+    for _ in range(1000):
+        c.put(1)
+        env.run()
+    assert len(served) == 1000
+    assert len(c._getters) == 1
+    assert sum(len(b) for b in c._getters._buckets.values()) == 1
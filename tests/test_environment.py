@@ -1,5 +1,7 @@
 """Test asimpy Environment."""
 
+import logging
+
 from asimpy import Environment, Process, Timeout
 
 
@@ -102,3 +104,40 @@ def test_environment_log_messages():
         (2, "logger", "message 1"),
         (3, "logger", "message 2"),
     ]
+
+
+def test_environment_log_formats_lazily():
+    """Format arguments and callables are only used when the level is enabled."""
+    calls = []
+
+    def message():
+        calls.append(1)
+        return "built"
+
+    env = Environment(log_level=logging.INFO)
+    env.log("a", "%s=%d", "x", 3)
+    env.log("b", message)
+    env.log("c", message, level=logging.DEBUG)
+    env.log("d", "%s", object(), level=logging.DEBUG)
+    env.log("e", "100%", level=logging.WARNING)
+    assert env.get_log() == [(0, "a", "x=3"), (0, "b", "built"), (0, "e", "100%")]
+    assert len(calls) == 1
+
+
+def test_environment_log_level_can_be_changed_or_disabled():
+    """log_level filters records; None turns logging off entirely."""
+
+    class Logger(Process):
+        async def run(self):
+            self.log("p", "debug", level=logging.DEBUG)
+            self.log("p", "info")
+            await self.timeout(1)
+            self._env.log_level = None
+            self.log("p", "error", level=logging.ERROR)
+
+    env = Environment()
+    assert env.log_level == logging.NOTSET
+    Logger(env)
+    env.run()
+    assert env.log_level is None
+    assert env.get_log() == [(0, "p", "debug"), (0, "p", "info")]
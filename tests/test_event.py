@@ -79,7 +79,23 @@ def test_event_add_waiter_before_trigger():
 
     callback = Mock()
     evt._add_waiter(callback)
-    assert len(evt._waiters) == 1
+    # A single waiter is stored inline rather than in a list.
+    assert evt._waiters is callback
+    callback.assert_not_called()
+
+
+def test_event_second_waiter_spills_to_list():
+    """Test that a second waiter moves both into a list, notified in order."""
+    env = Environment()
+    evt = Event(env)
+    calls = []
+    evt._add_waiter(lambda v: calls.append(("a", v)))
+    evt._add_waiter(lambda v: calls.append(("b", v)))
+    evt._add_waiter(lambda v: calls.append(("c", v)))
+    assert isinstance(evt._waiters, list) and len(evt._waiters) == 3
+    evt.succeed(7)
+    assert calls == [("a", 7), ("b", 7), ("c", 7)]
+    assert evt._waiters is None
 
 
 def test_event_cancel_callback():
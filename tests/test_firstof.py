@@ -267,7 +267,7 @@ def test_firstof_requires_at_least_one_event():
 def test_firstof_rejects_non_event_argument():
     """FirstOf raises TypeError when an argument is not an Event."""
     env = Environment()
-    with pytest.raises(TypeError, match="must be an Event"):
+    with pytest.raises(TypeError, match="must be an Event or process"):
         FirstOf(env, a="not an event")
 
 
@@ -292,3 +292,26 @@ def test_firstof_same_event_twice_second_child_done_returns_early():
     env.run()
     # 'a' is registered first, so it wins.
     assert proc.result == ("a", "shared")
+
+
+def test_firstof_shared_put_result_survives_losing():
+    """A shared pre-triggered put() result stays triggered after FirstOf cancels it."""
+
+    class Racer(Process):
+        def init(self, q):
+            self.q = q
+            self.results = []
+
+        async def run(self):
+            ready = Event(self._env)
+            ready.succeed("first")
+            # Both puts succeed immediately and return the same shared event.
+            self.results.append(await FirstOf(self._env, a=ready, b=self.q.put(1)))
+            self.results.append(await FirstOf(self._env, b=self.q.put(2)))
+
+    env = Environment()
+    q = Queue(env)
+    proc = Racer(env, q)
+    env.run()
+    assert proc.results == [("a", "first"), ("b", True)]
+    assert list(q._items) == [1, 2]
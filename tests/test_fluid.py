@@ -0,0 +1,158 @@
+"""Test asimpy FluidContainer."""
+
+import pytest
+from asimpy import Environment, FirstOf, FluidContainer
+
+
+def test_fluid_invalid_arguments():
+    env = Environment()
+    with pytest.raises(ValueError, match="capacity must be positive"):
+        FluidContainer(env, capacity=0)
+    with pytest.raises(ValueError, match="init must be non-negative"):
+        FluidContainer(env, init=-1)
+    with pytest.raises(ValueError, match="must be <= capacity"):
+        FluidContainer(env, capacity=5, init=6)
+    tank = FluidContainer(env)
+    with pytest.raises(ValueError, match="amount must be positive"):
+        tank.get(0)
+    with pytest.raises(ValueError, match="amount must be positive"):
+        tank.put(-1)
+
+
+def test_fluid_level_is_linear_and_clipped():
+    """The level follows the net rate and stops at the boundaries."""
+    env = Environment()
+    tank = FluidContainer(env, capacity=10, init=4)
+    levels = []
+
+    async def sampler():
+        tank.flow(2)
+        for delay in [1, 9]:
+            await env.timeout(delay)
+            levels.append(tank.level)
+        tank.flow(-5)
+        for delay in [2, 8]:
+            await env.timeout(delay)
+            levels.append(tank.level)
+
+    env.process(sampler())
+    env.run()
+    assert levels == [6, 10, 4, 0]
+    assert tank.rate == -3
+
+
+def test_fluid_thresholds_fire_at_crossing_time():
+    """when_at_least and when_at_most resolve when the flows cross them."""
+    env = Environment()
+    tank = FluidContainer(env, capacity=100)
+    log = []
+
+    async def controller():
+        pump = tank.flow(2.5)
+        level = await tank.when_at_least(80)
+        log.append((env.now, level))
+        pump.stop()
+        tank.flow(-1)
+        level = await tank.when_at_most(5)
+        log.append((env.now, level))
+
+    env.process(controller())
+    env.run()
+    assert log == [(32, 80), (107, 5)]
+
+
+def test_fluid_get_waits_for_inflow():
+    """A blocked get is served when the inflow has supplied enough."""
+    env = Environment()
+    tank = FluidContainer(env)
+    tank.flow(2.5)
+    times = []
+
+    async def consumer():
+        for _ in range(3):
+            await tank.get(10)
+            times.append(env.now)
+
+    env.process(consumer())
+    env.run(until=100)
+    assert times == [4, 8, 12]
+
+
+def test_fluid_put_waits_for_outflow():
+    """A blocked put is served once the outflow has made room."""
+    env = Environment()
+    tank = FluidContainer(env, capacity=10, init=10)
+    tank.flow(-2)
+    done = []
+
+    async def producer():
+        await tank.put(6)
+        done.append((env.now, tank.level))
+
+    env.process(producer())
+    env.run()
+    assert done == [(3, 10)]
+
+
+def test_fluid_rate_change_reschedules():
+    """Changing a rate moves the pending crossing and discards the old one."""
+    env = Environment()
+    tank = FluidContainer(env)
+    pump = tank.flow(1)
+    seen = []
+
+    async def watcher():
+        await tank.when_at_least(10)
+        seen.append(env.now)
+
+    async def booster():
+        await env.timeout(2)
+        pump.rate = 4
+
+    env.process(watcher())
+    env.process(booster())
+    env.run()
+    assert seen == [4]
+
+
+def test_fluid_schedules_one_event_per_request():
+    """Steady flows cost one scheduled entry per request served."""
+    env = Environment()
+    tank = FluidContainer(env)
+    tank.flow(0.001)
+
+    async def consumer():
+        for _ in range(10):
+            await tank.get(1)
+
+    env.process(consumer())
+    env.run()
+    assert env.now == pytest.approx(10_000)
+    assert next(env._serial) <= 12
+
+
+def test_fluid_cancelled_get_restores_level():
+    """A get that loses a FirstOf gives its amount back."""
+    env = Environment()
+    tank = FluidContainer(env, init=5)
+    results = []
+
+    async def racer():
+        results.append(await FirstOf(env, a=tank.get(1), b=tank.get(3)))
+
+    env.process(racer())
+    env.run()
+    assert results == [("a", 1)]
+    assert tank.level == 4
+
+
+def test_fluid_cancelled_blocked_get_lets_next_through():
+    """Withdrawing a large blocked get serves a smaller one behind it."""
+    env = Environment()
+    tank = FluidContainer(env, init=4)
+    big = tank.get(10)
+    small = tank.get(2)
+    assert not small.triggered
+    big.cancel()
+    assert small.triggered
+    assert tank.level == 2
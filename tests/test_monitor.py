@@ -0,0 +1,168 @@
+"""Test asimpy TimeWeighted and the monitor= option of primitives."""
+
+import random
+import statistics
+
+import pytest
+from asimpy import (
+    Container,
+    Environment,
+    FirstOf,
+    PriorityQueue,
+    Queue,
+    Resource,
+    Store,
+    TimeWeighted,
+)
+
+
+def _at(env, time, func):
+    """Call func() at the given simulated time."""
+    env.schedule(time, func)
+
+
+def test_time_weighted_statistics():
+    """Mean, variance, extremes and time at level are weighted by duration."""
+    env = Environment()
+    tw = TimeWeighted(env)
+    _at(env, 2, lambda: tw.record(4))
+    _at(env, 3, lambda: tw.record(1))
+    _at(env, 7, lambda: None)
+    env.run()
+    # 0 for 2 units, 4 for 1 unit, 1 for 4 units.
+    assert tw.duration == 7
+    assert tw.mean == pytest.approx(8 / 7)
+    values = [0, 0, 4, 1, 1, 1, 1]
+    assert tw.variance == pytest.approx(statistics.pvariance(values))
+    assert tw.std == pytest.approx(statistics.pstdev(values))
+    assert (tw.min, tw.max, tw.value) == (0, 4, 1)
+    assert tw.time_at_level() == {0: 2, 4: 1, 1: 4}
+
+
+def test_time_weighted_ignores_unchanged_values():
+    """Recording the current value again changes nothing."""
+    env = Environment()
+    tw = TimeWeighted(env, value=3)
+    _at(env, 1, lambda: tw.record(3))
+    _at(env, 2, lambda: None)
+    env.run()
+    assert tw.time_at_level() == {3: 2}
+    assert tw.mean == 3
+    assert tw.variance == 0
+
+
+def test_time_weighted_before_time_passes():
+    env = Environment()
+    tw = TimeWeighted(env, value=5)
+    assert tw.mean == 5
+    assert tw.variance == 0
+    assert tw.time_at_level() == {}
+
+
+def test_time_weighted_without_levels():
+    env = Environment()
+    tw = TimeWeighted(env, levels=False)
+    tw.record(1.5)
+    with pytest.raises(ValueError, match="levels=False"):
+        tw.time_at_level()
+
+
+def test_container_monitor_skips_levels_by_default():
+    """A monitored Container keeps O(1) state unless levels=True."""
+    env = Environment()
+    c = Container(env, monitor=True)
+
+    async def filler():
+        for i in range(1000):
+            await env.timeout(1)
+            c.put(0.5 + i / 1000)
+
+    env.process(filler())
+    env.run()
+    assert c.monitor._levels is None
+    with pytest.raises(ValueError):
+        c.monitor.time_at_level()
+    assert c.monitor.max == c.level
+
+
+def test_primitives_are_unmonitored_by_default():
+    env = Environment()
+    assert Resource(env).monitor is None
+    assert Queue(env).monitor is None
+    assert Container(env).monitor is None
+    assert Store(env).monitor is None
+
+
+def test_resource_monitor_matches_busy_time():
+    """The monitored count integrates to the total service time."""
+    rng = random.Random(99)
+    env = Environment()
+    server = Resource(env, capacity=2, monitor=True)
+    busy = [0.0]
+
+    async def customer(arrival, service):
+        await env.timeout(arrival)
+        async with server:
+            await env.timeout(service)
+            busy[0] += service
+
+    for _ in range(200):
+        env.process(customer(rng.uniform(0, 100), rng.expovariate(1.0)))
+    env.run()
+    tw = server.monitor
+    assert tw.mean * tw.duration == pytest.approx(busy[0])
+    assert tw.max == 2 and tw.min == 0
+    assert sum(tw.time_at_level().values()) == pytest.approx(env.now)
+
+
+@pytest.mark.parametrize("cls", [Queue, PriorityQueue])
+def test_queue_monitor_tracks_size(cls):
+    env = Environment()
+    q = cls(env, monitor=True)
+
+    async def producer():
+        for i in range(3):
+            await q.put(i)
+            await env.timeout(1)
+
+    async def consumer():
+        await env.timeout(5)
+        for _ in range(3):
+            await q.get()
+            await env.timeout(1)
+
+    env.process(producer())
+    env.process(consumer())
+    env.run()
+    # Up 1, 2, 3 one unit apart, 3 until t=5, then down 2, 1, 0 to t=8.
+    assert q.monitor.time_at_level() == {1: 2, 2: 2, 3: 3, 0: 1}
+    assert q.monitor.value == 0
+
+
+def test_container_monitor_tracks_level_and_cancel():
+    """A get discarded by FirstOf shows up as the level going back up."""
+    env = Environment()
+    c = Container(env, capacity=10, init=6, monitor=True, levels=True)
+
+    async def racer():
+        await FirstOf(env, a=c.get(1), b=c.get(2))
+        await env.timeout(1)
+
+    env.process(racer())
+    env.run()
+    assert c.level == 5
+    assert c.monitor.value == 5
+    assert c.monitor.min == 3
+    assert c.monitor.time_at_level() == {5: 1}
+
+
+def test_store_monitor_tracks_len():
+    env = Environment()
+    s = Store(env, monitor=True)
+    s.try_put("a")
+    s.put("b")
+    _at(env, 4, lambda: s.try_get())
+    _at(env, 6, lambda: None)
+    env.run()
+    assert s.monitor.time_at_level() == {2: 4, 1: 2}
+    assert s.monitor.mean == pytest.approx(10 / 6)
@@ -1,7 +1,9 @@
 """Tests for active_process and PreemptiveResource."""
 
+import random
+
 import pytest
-from asimpy import Environment, Interrupt, Process
+from asimpy import Environment, Event, FirstOf, Interrupt, Process
 from asimpy import Preempted, PreemptiveResource
 
 
@@ -483,8 +485,353 @@ def test_release_skips_cancelled_waiter():
     env.run(until=2)
 
     # Both waiters are now parked; cancel the first one's event.
-    res._waiters[0][3].cancel()
+    res._waiters[0][2].event.cancel()
 
     env.run()  # continue to completion
     assert not w1.acquired  # cancelled waiter never got the resource
     assert w2.acquired
+
+
+def test_many_waiters_served_in_priority_then_fifo_order():
+    """Cancelled waiters are skipped; the rest come out in (priority, arrival) order."""
+    rng = random.Random(99)
+    served = []
+
+    async def holder(env, res):
+        await res.acquire()
+        await env.timeout(1)
+        res.release()
+
+    async def waiter(env, res, priority, ident):
+        try:
+            await res.acquire(priority=priority, preempt=False)
+        except Interrupt:
+            return
+        served.append((priority, ident))
+        res.release()
+
+    async def canceller(env, victims):
+        await env.timeout(0.5)
+        for task in victims:
+            task.interrupt()
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(holder(env, res))
+    requests = [(rng.randint(0, 5), i) for i in range(300)]
+    tasks = [env.process(waiter(env, res, p, i)) for p, i in requests]
+    victims = set(rng.sample(range(300), 100))
+    env.process(canceller(env, [tasks[i] for i in sorted(victims)]))
+    env.run()
+    expected = sorted(r for r in requests if r[1] not in victims)
+    assert served == expected
+    assert len(res._waiters) == 0
+    assert res.count == 0
+
+
+def test_process_holding_two_units_releases_both():
+    """A process may hold several units and release them one at a time."""
+
+    async def greedy(env, res, log):
+        await res.acquire()
+        await res.acquire()
+        log.append(res.count)
+        res.release()
+        log.append(res.count)
+        res.release()
+        log.append(res.count)
+
+    env = Environment()
+    res = PreemptiveResource(env, capacity=2)
+    log = []
+    env.process(greedy(env, res, log))
+    env.run()
+    assert log == [2, 1, 0]
+    assert res._held == {}
+
+
+def test_cancelled_waiters_are_compacted():
+    """Cancelling most waiters rebuilds the waiter heap without them."""
+
+    async def holder(env, res):
+        await res.acquire()
+        await env.timeout(10)
+        res.release()
+
+    async def waiter(env, res):
+        try:
+            await res.acquire(preempt=False)
+            res.release()
+        except Interrupt:
+            pass
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(holder(env, res))
+    tasks = [env.process(waiter(env, res)) for _ in range(400)]
+    env.run(until=1)
+    assert len(res._waiters) == 400
+    for task in tasks[:300]:
+        task.interrupt()
+    env.run(until=2)
+    assert len(res._waiters) < 200
+    env.run()
+    assert res.count == 0
+
+
+def test_acquire_returns_event_with_token():
+    """acquire() returns an Event whose value can be passed to release()."""
+    log = []
+
+    async def user(env, res):
+        evt = res.acquire()
+        assert isinstance(evt, Event)
+        token = await evt
+        log.append(res.count)
+        res.release(token)
+        log.append(res.count)
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(user(env, res))
+    env.run()
+    assert log == [1, 0]
+
+
+def test_release_token_from_another_process():
+    """A token can be released by a process other than the acquirer."""
+    tokens = []
+    served = []
+
+    async def acquirer(env, res):
+        tokens.append(await res.acquire())
+
+    async def releaser(env, res):
+        await env.timeout(5)
+        res.release(tokens[0])
+
+    async def waiter(env, res):
+        await env.timeout(1)
+        token = await res.acquire(preempt=False)
+        served.append(env.now)
+        res.release(token)
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(acquirer(env, res))
+    env.process(releaser(env, res))
+    env.process(waiter(env, res))
+    env.run()
+    assert served == [5]
+    assert res.count == 0
+
+
+def test_acquire_raced_against_timeout():
+    """A waiting acquire that loses a FirstOf is withdrawn from the queue."""
+    results = []
+
+    async def holder(env, res):
+        token = await res.acquire(priority=5)
+        await env.timeout(10)
+        res.release(token)
+
+    async def impatient(env, res):
+        await env.timeout(1)
+        key, _ = await FirstOf(
+            env, got=res.acquire(priority=1, preempt=False), gave_up=env.timeout(2)
+        )
+        results.append((env.now, key))
+
+    async def patient(env, res):
+        await env.timeout(2)
+        token = await res.acquire(priority=9, preempt=False)
+        results.append((env.now, "patient"))
+        res.release(token)
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(holder(env, res))
+    env.process(impatient(env, res))
+    env.process(patient(env, res))
+    env.run()
+    assert results == [(3, "gave_up"), (10, "patient")]
+    assert res.count == 0
+
+
+def test_acquire_won_in_firstof_holds_unit():
+    """An acquire that wins a FirstOf yields a token that holds the unit."""
+    results = []
+
+    async def user(env, res):
+        key, token = await FirstOf(env, got=res.acquire(), gave_up=env.timeout(1))
+        results.append((key, res.count))
+        res.release(token)
+        results.append(res.count)
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(user(env, res))
+    env.run()
+    assert results == [("got", 1), 0]
+
+
+def test_release_stale_token_raises():
+    """Releasing a token twice, or after preemption, raises RuntimeError."""
+    errors = []
+
+    async def victim(env, res):
+        token = await res.acquire(priority=5)
+        try:
+            await env.timeout(10)
+        except Interrupt:
+            pass
+        try:
+            res.release(token)
+        except RuntimeError:
+            errors.append("preempted")
+
+    async def preemptor(env, res):
+        await env.timeout(1)
+        token = await res.acquire(priority=0)
+        res.release(token)
+        try:
+            res.release(token)
+        except RuntimeError:
+            errors.append("twice")
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(victim(env, res))
+    env.process(preemptor(env, res))
+    env.run()
+    assert sorted(errors) == ["preempted", "twice"]
+
+
+def test_serve_completes_after_demand():
+    """serve() triggers once the job has received its full service time."""
+    done = []
+
+    async def job(env, res, demand):
+        await res.serve(demand)
+        done.append(env.now)
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(job(env, res, 5))
+    env.process(job(env, res, 2))
+    env.run()
+    assert done == [5, 7]
+    assert res.count == 0
+
+
+def test_serve_preempt_resume():
+    """A preempted job keeps its progress and resumes without any Interrupt."""
+    done = {}
+
+    async def job(env, res, name, arrival, demand, priority):
+        await env.timeout(arrival)
+        await res.serve(demand, priority=priority)
+        done[name] = env.now
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(job(env, res, "low", 0, 10, 5))
+    env.process(job(env, res, "high", 4, 3, 0))
+    env.run()
+    # low runs 0-4, high 4-7, low resumes 7-13.
+    assert done == {"high": 7, "low": 13}
+
+
+def test_serve_preempted_job_keeps_queue_position():
+    """A resumed job goes ahead of same-priority jobs that arrived after it."""
+    done = []
+
+    async def job(env, res, name, arrival, demand, priority):
+        await env.timeout(arrival)
+        await res.serve(demand, priority=priority)
+        done.append((env.now, name))
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(job(env, res, "first", 0, 4, 5))
+    env.process(job(env, res, "second", 1, 1, 5))
+    env.process(job(env, res, "urgent", 2, 1, 0))
+    env.run()
+    assert done == [(3, "urgent"), (5, "first"), (6, "second")]
+
+
+def test_serve_job_preempted_by_acquire():
+    """An acquiring process can preempt a job; the job resumes after release."""
+    log = []
+
+    async def job(env, res):
+        await res.serve(6, priority=5)
+        log.append(("job", env.now))
+
+    async def user(env, res):
+        await env.timeout(2)
+        token = await res.acquire(priority=0)
+        await env.timeout(3)
+        res.release(token)
+        log.append(("user", env.now))
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(job(env, res))
+    env.process(user(env, res))
+    env.run()
+    assert log == [("user", 5), ("job", 9)]
+
+
+def test_serve_job_preempts_acquirer():
+    """A job that preempts an acquiring process interrupts it as acquire() would."""
+    causes = []
+
+    async def user(env, res):
+        await res.acquire(priority=5)
+        try:
+            await env.timeout(10)
+        except Interrupt as exc:
+            causes.append((env.now, exc.cause.by, exc.cause.usage_since))
+
+    async def job(env, res):
+        await env.timeout(3)
+        await res.serve(1, priority=0)
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(user(env, res))
+    env.process(job(env, res))
+    env.run()
+    assert causes == [(3, None, 0)]
+    assert res.count == 0
+
+
+def test_serve_cancel_in_service_frees_unit():
+    """Cancelling a job that is being served frees its unit for the next job."""
+    log = []
+
+    async def impatient(env, res):
+        key, _ = await FirstOf(env, done=res.serve(10), gave_up=env.timeout(2))
+        log.append((env.now, key))
+
+    async def job(env, res):
+        await env.timeout(1)
+        await res.serve(3)
+        log.append((env.now, "job"))
+
+    env = Environment()
+    res = PreemptiveResource(env)
+    env.process(impatient(env, res))
+    env.process(job(env, res))
+    env.run()
+    assert log == [(2, "gave_up"), (5, "job")]
+    assert env.dead_count == 0
+
+
+def test_serve_rejects_negative_demand():
+    """serve() rejects a negative service demand."""
+    env = Environment()
+    res = PreemptiveResource(env)
+    with pytest.raises(ValueError, match="demand"):
+        res.serve(-1)
@@ -1,5 +1,7 @@
 """Test asimpy priority queue."""
 
+import random
+
 from asimpy import Environment, PriorityQueue, Process
 
 
@@ -85,6 +87,143 @@ def test_priority_queue_put_back():
     """PriorityQueue._put_back() re-inserts an item in sorted order."""
     env = Environment()
     pq = PriorityQueue(env)
-    pq._items = [1, 3, 5]
+    for item in [5, 1, 3]:
+        pq.try_put(item)
     pq._put_back(2)
-    assert pq._items == [1, 2, 3, 5]
+    assert [pq.try_get() for _ in range(4)] == [1, 2, 3, 5]
+
+
+class Job:
+    """Item ordered by rank only, so equal ranks are not distinguishable."""
+
+    def __init__(self, rank, name):
+        self.rank = rank
+        self.name = name
+
+    def __lt__(self, other):
+        return self.rank < other.rank
+
+    def __eq__(self, other):
+        return self.rank == other.rank
+
+
+def test_priority_queue_equal_items_are_fifo():
+    """Items that compare equal come out in insertion order."""
+    env = Environment()
+    pq = PriorityQueue(env)
+    for rank, name in [(2, "a"), (1, "b"), (2, "c"), (1, "d"), (2, "e")]:
+        pq.try_put(Job(rank, name))
+    assert [pq.try_get().name for _ in range(5)] == ["b", "d", "a", "c", "e"]
+
+
+def test_priority_queue_put_back_keeps_place_among_equals():
+    """A cancelled get returns its item ahead of equal items."""
+    env = Environment()
+    pq = PriorityQueue(env)
+    for name in "abc":
+        pq.try_put(Job(1, name))
+    evt = pq.get()
+    assert evt.triggered
+    evt.cancel()
+    assert [pq.try_get().name for _ in range(3)] == ["a", "b", "c"]
+
+
+def test_priority_queue_matches_sorted_order():
+    """Interleaved puts and gets agree with a sorted reference."""
+    rng = random.Random(7)
+    env = Environment()
+    pq = PriorityQueue(env)
+    reference = []
+    for _ in range(2000):
+        if reference and rng.random() < 0.4:
+            reference.sort()
+            assert pq.try_get() == reference.pop(0)
+        else:
+            item = rng.randint(0, 50)
+            pq.try_put(item)
+            reference.append(item)
+    assert [pq.try_get() for _ in range(len(reference))] == sorted(reference)
+
+
+def test_priority_queue_explicit_priority_never_compares_items():
+    """put(item, priority=) orders by priority and never compares payloads."""
+    env = Environment()
+    pq = PriorityQueue(env)
+    pq.put({"name": "low"}, priority=5)
+    pq.put({"name": "high"}, priority=1)
+    pq.try_put({"name": "also high"}, priority=1)
+    names = [pq.try_get()["name"] for _ in range(3)]
+    assert names == ["high", "also high", "low"]
+
+
+def test_priority_queue_key_function():
+    """A key function computes each item's priority once, at put time."""
+    calls = []
+
+    def key(item):
+        calls.append(item)
+        return -item
+
+    env = Environment()
+    pq = PriorityQueue(env, key=key)
+    for item in [1, 3, 2]:
+        pq.try_put(item)
+    assert [pq.try_get() for _ in range(3)] == [3, 2, 1]
+    assert calls == [1, 3, 2]
+
+
+def test_priority_queue_explicit_priority_overrides_key():
+    """An explicit priority takes precedence over the key function."""
+    env = Environment()
+    pq = PriorityQueue(env, key=lambda item: item)
+    pq.try_put(1)
+    pq.try_put(9, priority=0)
+    assert pq.try_get() == 9
+
+
+def test_priority_queue_blocked_putter_keeps_priority():
+    """An item waiting for capacity enters the heap with its priority."""
+    results = []
+
+    async def producer(env, pq):
+        await pq.put("a", priority=5)
+        await pq.put("b", priority=0)
+        results.append(("put b", env.now))
+
+    async def consumer(env, pq):
+        await env.timeout(1)
+        results.append(await pq.get())
+        await env.timeout(1)
+        results.append(await pq.get())
+
+    env = Environment()
+    pq = PriorityQueue(env, capacity=1)
+    env.process(producer(env, pq))
+    env.process(consumer(env, pq))
+    env.run()
+    assert results == ["a", ("put b", 1), "b"]
+
+
+def test_priority_queue_cancelled_get_keeps_priority():
+    """An item returned by a cancelled get keeps its explicit priority."""
+    env = Environment()
+    pq = PriorityQueue(env)
+    pq.try_put("urgent", priority=0)
+    pq.try_put("later", priority=3)
+    evt = pq.get()
+    assert evt.triggered
+    evt.cancel()
+    pq.try_put("middle", priority=1)
+    assert [pq.try_get() for _ in range(3)] == ["urgent", "middle", "later"]
+
+
+def test_priority_queue_getter_cancel_keeps_priority():
+    """An item handed straight to a waiting getter is put back with its priority."""
+    env = Environment()
+    pq = PriorityQueue(env)
+    getter = pq.get()
+    pq.put("urgent", priority=0)
+    assert getter.triggered
+    pq.try_put("later", priority=3)
+    getter.cancel()
+    assert [pq.try_get() for _ in range(2)] == ["urgent", "later"]
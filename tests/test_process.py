@@ -1,7 +1,7 @@
 """Test asimpy process."""
 
 import pytest
-from asimpy import Environment, Event, Interrupt, Process
+from asimpy import AllOf, Environment, Event, FirstOf, Interrupt, Process
 
 
 def test_process_basic_execution():
@@ -232,3 +232,119 @@ def test_process_tight_loop_interrupt_delivered():
     proc = SelfInterruptor(env)
     env.run()
     assert proc.result == "self-interrupt"
+
+
+class Child(Process):
+    def init(self, delay, result):
+        self.delay = delay
+        self.result = result
+
+    async def run(self):
+        await self.timeout(self.delay)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_process_await_returns_result():
+    """Test that awaiting a process returns its coroutine's return value."""
+    results = []
+
+    class Parent(Process):
+        async def run(self):
+            results.append(await Child(self._env, 3, "done"))
+            results.append(self.now)
+
+    env = Environment()
+    Parent(env)
+    env.run()
+    assert results == ["done", 3]
+
+
+def test_process_await_reraises_exception():
+    """Test that a joined process's exception is raised in the joiner, not run()."""
+    caught = []
+
+    class Parent(Process):
+        async def run(self):
+            try:
+                await Child(self._env, 2, ValueError("bad"))
+            except ValueError as exc:
+                caught.append((self.now, str(exc)))
+
+    env = Environment()
+    Parent(env)
+    env.run()
+    assert caught == [(2, "bad")]
+
+
+def test_process_join_after_finish():
+    """Test that joining a finished process triggers immediately with its result."""
+    env = Environment()
+    child = Child(env, 1, 42)
+    env.run()
+    results = []
+
+    async def late(env):
+        results.append((env.now, await child))
+
+    env.process(late(env))
+    env.run()
+    assert results == [(1, 42)]
+
+
+def test_process_join_in_allof_and_firstof():
+    """Test that processes can be combined with AllOf and FirstOf."""
+    results = []
+
+    class Parent(Process):
+        async def run(self):
+            env = self._env
+            both = await AllOf(env, a=Child(env, 2, "a"), b=Child(env, 5, "b"))
+            results.append((self.now, both))
+            first = await FirstOf(env, slow=Child(env, 9, "s"), fast=Child(env, 1, "f"))
+            results.append((self.now, first))
+
+    env = Environment()
+    Parent(env)
+    env.run()
+    assert results == [(5, {"a": "a", "b": "b"}), (6, ("fast", "f"))]
+
+
+def test_process_join_losing_firstof_does_not_affect_other_joiners():
+    """Test that cancelling one join event leaves other joiners waiting."""
+    results = []
+    env = Environment()
+    child = Child(env, 5, "child")
+
+    async def impatient(env):
+        results.append(("impatient", await FirstOf(env, c=child, t=env.timeout(1))))
+
+    async def patient(env):
+        results.append(("patient", await child))
+
+    env.process(impatient(env))
+    env.process(patient(env))
+    env.run()
+    assert results == [("impatient", ("t", None)), ("patient", "child")]
+
+
+def test_process_exception_without_joiner_propagates():
+    """Test that an unjoined process's exception still propagates out of run()."""
+    env = Environment()
+    Child(env, 1, RuntimeError("boom"))
+    with pytest.raises(RuntimeError, match="boom"):
+        env.run()
+
+
+def test_process_cancelled_joiner_does_not_swallow_exception():
+    """Test that a failure propagates if every joiner has given up."""
+    env = Environment()
+    child = Child(env, 5, RuntimeError("late"))
+
+    async def impatient(env):
+        await FirstOf(env, c=child, t=env.timeout(1))
+
+    env.process(impatient(env))
+    with pytest.raises(RuntimeError, match="late"):
+        env.run()
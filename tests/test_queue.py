@@ -1,7 +1,15 @@
 """Test asimpy queue."""
 
 import pytest
-from asimpy import Environment, Queue, Process, QueueEmpty, QueueFull
+from asimpy import (
+    Environment,
+    FirstOf,
+    PriorityQueue,
+    Process,
+    Queue,
+    QueueEmpty,
+    QueueFull,
+)
 from asimpy.event import _CANCELLED, Event
 
 
@@ -502,3 +510,52 @@ def test_queue_try_put_full():
     q._add("existing")
     with pytest.raises(QueueFull):
         q.try_put("overflow")
+
+
+def test_queue_immediate_put_returns_shared_event():
+    """Non-blocking puts share one pre-triggered event that ignores cancel()."""
+    env = Environment()
+    q = Queue(env)
+    first = q.put("a")
+    second = q.put("b")
+    assert first is second
+    assert first.triggered and first._value is True
+    first.cancel()
+    assert first.triggered and not first.cancelled
+    assert list(q._items) == ["a", "b"]
+
+
+@pytest.mark.parametrize("cls", [Queue, PriorityQueue])
+def test_queue_cancelled_getters_are_compacted(cls):
+    """Getters abandoned by FirstOf timeouts do not accumulate."""
+    env = Environment()
+    q = cls(env)
+
+    async def requester():
+        for _ in range(1000):
+            await FirstOf(env, reply=q.get(), expire=env.timeout(1))
+
+    env.process(requester())
+    env.run()
+    assert len(q._getters) <= 2 * Queue._COMPACT_MIN
+    q.put("late")
+    assert q.size() == 1
+
+
+@pytest.mark.parametrize("cls", [Queue, PriorityQueue])
+def test_queue_cancelled_putters_are_compacted(cls):
+    """Putters abandoned by FirstOf timeouts do not accumulate, and order is kept."""
+    env = Environment()
+    q = cls(env, capacity=1)
+    q.try_put(0)
+
+    async def impatient():
+        for i in range(1000):
+            await FirstOf(env, done=q.put(i + 1), expire=env.timeout(1))
+
+    env.process(impatient())
+    env.run()
+    assert len(q._putters) <= 2 * Queue._COMPACT_MIN
+    waiting = q.put(2000)
+    assert q.get()._value == 0
+    assert waiting.triggered and q.try_get() == 2000
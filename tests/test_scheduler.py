@@ -0,0 +1,191 @@
+"""Test asimpy schedulers."""
+
+import random
+
+import pytest
+from asimpy import (
+    ArrayHeapScheduler,
+    BucketScheduler,
+    CalendarScheduler,
+    Environment,
+    HeapScheduler,
+    Process,
+)
+
+SCHEDULERS = [HeapScheduler, ArrayHeapScheduler, CalendarScheduler, BucketScheduler]
+
+
+def _drain(sched, until=None):
+    result = []
+    while (entry := sched.pop(until)) is not None:
+        result.append(entry)
+    return result
+
+
+def _delay(cls, delay):
+    return int(delay) if cls is BucketScheduler else delay
+
+
+@pytest.mark.parametrize("cls", SCHEDULERS)
+def test_scheduler_empty_pop_returns_none(cls):
+    """Test that popping an empty scheduler returns None."""
+    sched = cls()
+    assert len(sched) == 0
+    assert sched.pop() is None
+
+
+@pytest.mark.parametrize("cls", SCHEDULERS)
+def test_scheduler_pops_in_time_then_serial_order(cls):
+    """Test that entries come out ordered by time, ties broken by serial."""
+    sched = cls()
+    sched.push(5, 0, "a")
+    sched.push(1, 1, "b")
+    sched.push(5, 2, "c")
+    sched.push(3, 3, "d")
+    assert len(sched) == 4
+    assert [cb for _, _, cb in _drain(sched)] == ["b", "d", "a", "c"]
+    assert len(sched) == 0
+
+
+@pytest.mark.parametrize("cls", SCHEDULERS)
+def test_scheduler_pop_respects_until(cls):
+    """Test that pop(until) leaves entries later than until in place."""
+    sched = cls()
+    sched.push(1, 0, "a")
+    sched.push(10, 1, "b")
+    assert [cb for _, _, cb in _drain(sched, until=5)] == ["a"]
+    assert len(sched) == 1
+    assert sched.pop()[2] == "b"
+
+
+@pytest.mark.parametrize("cls", SCHEDULERS)
+def test_scheduler_matches_sorted_order_under_hold_model(cls):
+    """Test interleaved push/pop against a sorted reference."""
+    rng = random.Random(1234)
+    sched = cls()
+    serial = 0
+    now = 0
+    for _ in range(500):
+        sched.push(now + _delay(cls, rng.expovariate(1.0)), serial, serial)
+        serial += 1
+    popped = []
+    for _ in range(5000):
+        time, _, _ = sched.pop()
+        assert time >= now
+        now = time
+        popped.append(time)
+        # Mix in ties and occasional far-future events to force resizing.
+        delay = rng.choice([0, rng.expovariate(1.0), rng.uniform(0, 1000)])
+        sched.push(now + _delay(cls, delay), serial, serial)
+        serial += 1
+    popped.extend(t for t, _, _ in _drain(sched))
+    assert popped == sorted(popped)
+    assert len(popped) == 5500
+
+
+@pytest.mark.parametrize("cls", SCHEDULERS)
+def test_scheduler_compact_removes_dead_entries(cls):
+    """Test that compact() drops matching entries and keeps the rest in order."""
+    sched = cls()
+    for serial, time in enumerate([4, 1, 3, 1, 2, 5]):
+        sched.push(time, serial, "dead" if serial % 2 else f"live{serial}")
+    assert sched.compact(lambda cb: cb == "dead") == 3
+    assert len(sched) == 3
+    assert [cb for _, _, cb in _drain(sched)] == ["live4", "live2", "live0"]
+
+
+def test_calendar_scheduler_push_before_scan_position():
+    """Test that an entry earlier than the scan position is still popped first."""
+    sched = CalendarScheduler()
+    sched.push(100, 0, "late")
+    assert sched.pop(until=50) is None
+    sched.push(20, 1, "early")
+    assert [cb for _, _, cb in _drain(sched)] == ["early", "late"]
+
+
+def test_calendar_scheduler_many_ties_share_a_bucket():
+    """Test that entries at one time come out by serial amid later pushes."""
+    sched = CalendarScheduler()
+    for serial in range(5000):
+        sched.push(7, serial, serial)
+    # Entries that sort into the middle of the crowded bucket.
+    sched.push(6, 5000, "six")
+    sched.push(7.5, 5001, "later")
+    popped = [cb for _, _, cb in _drain(sched)]
+    assert popped == ["six", *range(5000), "later"]
+
+
+def test_calendar_scheduler_rejects_bad_parameters():
+    """Test that CalendarScheduler validates its parameters."""
+    with pytest.raises(ValueError, match="power of two"):
+        CalendarScheduler(nbuckets=3)
+    with pytest.raises(ValueError, match="width"):
+        CalendarScheduler(width=0)
+
+
+def test_bucket_scheduler_rejects_non_integer_time():
+    """Test that BucketScheduler only accepts integer times."""
+    sched = BucketScheduler()
+    with pytest.raises(TypeError, match="integer"):
+        sched.push(1.5, 0, "a")
+
+
+def test_bucket_scheduler_keeps_fifo_within_tick():
+    """Test that same-tick entries pushed while draining stay in FIFO order."""
+    env = Environment(scheduler=BucketScheduler())
+    results = []
+
+    def first():
+        results.append("first")
+        env.schedule(3, lambda: results.append("third"))
+
+    env.schedule(3, first)
+    env.schedule(3, lambda: results.append("second"))
+    env.schedule(4, lambda: results.append("fourth"))
+    env.run()
+    assert results == ["first", "second", "third", "fourth"]
+    assert env.now == 4
+
+
+@pytest.mark.parametrize("cls", SCHEDULERS)
+def test_environment_with_scheduler_runs_processes(cls):
+    """Test that processes behave the same with any scheduler."""
+
+    class Ticker(Process):
+        def init(self, name, delay, log):
+            self.name = name
+            self.delay = delay
+            self.log_ = log
+
+        async def run(self):
+            for _ in range(3):
+                await self.timeout(self.delay)
+                self.log_.append((self.now, self.name))
+
+    log = []
+    env = Environment(scheduler=cls())
+    Ticker(env, "a", 2, log)
+    Ticker(env, "b", 3, log)
+    env.run()
+    assert log == [
+        (2, "a"),
+        (3, "b"),
+        (4, "a"),
+        (6, "b"),
+        (6, "a"),
+        (9, "b"),
+    ]
+
+
+@pytest.mark.parametrize("cls", SCHEDULERS)
+def test_environment_with_scheduler_rewinds_after_cancelled_timeout(cls):
+    """Test that entries earlier than a popped cancelled Timeout fire in order."""
+    env = Environment(scheduler=cls())
+    env.timeout(100).cancel()
+    env.timeout(200)
+    env.run(until=150)
+    fired = []
+    for delay in [5, 1, 3, 2, 4, 150, 120, 7]:
+        env.schedule(env.now + delay, lambda d=delay: fired.append((env.now, d)))
+    env.run()
+    assert fired == [(d, d) for d in [1, 2, 3, 4, 5, 7, 120, 150]]
@@ -0,0 +1,153 @@
+"""Test asimpy log sinks."""
+
+import csv
+import io
+
+import pytest
+from asimpy import (
+    CallbackSink,
+    ColumnarSink,
+    CSVSink,
+    Environment,
+    ListSink,
+    NullSink,
+    Process,
+    RingSink,
+)
+
+
+class _Logger(Process):
+    """Log one message per time unit."""
+
+    def init(self, count):
+        self.count = count
+
+    async def run(self):
+        for i in range(self.count):
+            await self.timeout(1)
+            self.log("logger", f"message {i}")
+
+
+def _run(sink, count=5):
+    env = Environment(sink=sink)
+    _Logger(env, count)
+    env.run()
+    return env
+
+
+def test_default_sink_keeps_everything():
+    """Without a sink argument every record is kept in a ListSink."""
+    env = _run(None)
+    assert isinstance(env.sink, ListSink)
+    assert len(env.get_log()) == 5
+
+
+def test_ring_sink_keeps_most_recent():
+    """RingSink holds only the last `size` records."""
+    env = _run(RingSink(2))
+    assert env.get_log() == [(4, "logger", "message 3"), (5, "logger", "message 4")]
+
+
+def test_ring_sink_rejects_bad_size():
+    """RingSink needs a positive size."""
+    with pytest.raises(ValueError):
+        RingSink(0)
+
+
+def test_null_sink_discards_records():
+    """NullSink keeps nothing."""
+    env = _run(NullSink())
+    assert env.get_log() == []
+
+
+def test_callback_sink_calls_function():
+    """CallbackSink passes every record to its function."""
+    seen = []
+    _run(CallbackSink(lambda *rec: seen.append(rec)), count=2)
+    assert seen == [(1, "logger", "message 0"), (2, "logger", "message 1")]
+
+
+def test_csv_sink_writes_in_batches():
+    """CSVSink writes nothing until a batch fills, then everything on close."""
+    out = io.StringIO()
+    sink = CSVSink(out, batch_size=3)
+    env = Environment(sink=sink)
+    _Logger(env, 2)
+    env.run()
+    assert out.getvalue() == "time,name,message\r\n"
+    _Logger(env, 2)
+    env.run()
+    assert len(out.getvalue().splitlines()) == 4
+    sink.close()
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0] == ["time", "name", "message"]
+    assert rows[1:] == [
+        ["1", "logger", "message 0"],
+        ["2", "logger", "message 1"],
+        ["3", "logger", "message 0"],
+        ["4", "logger", "message 1"],
+    ]
+    assert not out.closed
+
+
+def test_csv_sink_owns_file_opened_from_path(tmp_path):
+    """A CSVSink given a path closes the file it opened."""
+    path = tmp_path / "log.csv"
+    with CSVSink(path, header=False) as sink:
+        _run(sink, count=2)
+    assert path.read_text().splitlines() == ["1,logger,message 0", "2,logger,message 1"]
+    sink.close()
+
+
+def test_columnar_sink_interns_names_and_messages():
+    """ColumnarSink stores codes and returns the same records as ListSink."""
+    sink = ColumnarSink()
+    env = Environment(sink=sink)
+    env.log("a", "up")
+    env.log("b", "up")
+    env.log("a", "down")
+    assert len(sink) == 3
+    assert sink.names == ["a", "b"]
+    assert sink.messages == ["up", "down"]
+    assert env.get_log() == [(0, "a", "up"), (0, "b", "up"), (0, "a", "down")]
+    columns = sink.columns()
+    assert columns["time"].format == "d"
+    assert columns["name"].tolist() == [0, 1, 0]
+    assert columns["message"].tolist() == [0, 0, 1]
+
+
+def test_columnar_sink_columns_share_memory():
+    """Exported columns are views: the sink cannot grow while they exist."""
+    sink = _run(ColumnarSink(), count=3).sink
+    view = sink.columns()["time"]
+    assert view.tolist() == [1.0, 2.0, 3.0]
+    with pytest.raises(BufferError):
+        sink.write(4, "logger", "late")
+    view.release()
+    sink.write(4, "logger", "late")
+    assert len(sink) == 4
+
+
+def test_columnar_sink_to_numpy():
+    """to_numpy() wraps the columns without copying them."""
+    np = pytest.importorskip("numpy")
+    sink = _run(ColumnarSink(), count=3).sink
+    arrays = sink.to_numpy()
+    assert arrays["time"].dtype == np.float64
+    assert arrays["time"].tolist() == [1.0, 2.0, 3.0]
+    assert [sink.messages[m] for m in arrays["message"]] == [
+        "message 0",
+        "message 1",
+        "message 2",
+    ]
+    assert not arrays["time"].flags.owndata
+
+
+def test_columnar_sink_to_arrow():
+    """to_arrow() builds dictionary-encoded columns over the sink's buffers."""
+    pytest.importorskip("pyarrow")
+    sink = _run(ColumnarSink(), count=3).sink
+    table = sink.to_arrow()
+    assert table.column("time").to_pylist() == [1.0, 2.0, 3.0]
+    assert table.column("name").to_pylist() == ["logger"] * 3
+    assert table.column("message").to_pylist()[-1] == "message 2"
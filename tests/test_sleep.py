@@ -0,0 +1,124 @@
+"""Test asimpy sleep."""
+
+import pytest
+from asimpy import Environment, FirstOf, Interrupt, Process, Sleep
+
+
+def test_sleep_advances_time():
+    """Test that awaiting a sleep advances the clock by its delay."""
+
+    class Sleeper(Process):
+        def init(self):
+            self.times = []
+
+        async def run(self):
+            for delay in (1, 0, 2.5):
+                result = await self.sleep(delay)
+                self.times.append((self.now, result))
+
+    env = Environment()
+    proc = Sleeper(env)
+    env.run()
+    assert proc.times == [(1, None), (1, None), (3.5, None)]
+
+
+def test_sleep_from_environment():
+    """Test that env.sleep() returns a Sleep usable by any process."""
+
+    class Sleeper(Process):
+        async def run(self):
+            await self._env.sleep(4)
+
+    env = Environment()
+    assert isinstance(env.sleep(1), Sleep)
+    Sleeper(env)
+    env.run()
+    assert env.now == 4
+
+
+def test_sleep_same_time_order_matches_timeout():
+    """Test that sleepers waking at the same time run in the order they slept."""
+
+    class Sleeper(Process):
+        def init(self, name, order):
+            self.name = name
+            self.order = order
+
+        async def run(self):
+            await self.sleep(5)
+            self.order.append(self.name)
+
+    env = Environment()
+    order = []
+    for name in "abc":
+        Sleeper(env, name, order)
+    env.run()
+    assert order == ["a", "b", "c"]
+
+
+def test_sleep_interrupted():
+    """Test that interrupting a sleeping process cancels the wakeup."""
+
+    class Sleeper(Process):
+        def init(self):
+            self.log_ = []
+
+        async def run(self):
+            try:
+                await self.sleep(10)
+                self.log_.append("woke")
+            except Interrupt as exc:
+                self.log_.append((self.now, exc.cause))
+            await self.sleep(1)
+            self.log_.append(self.now)
+
+    class Interrupter(Process):
+        def init(self, target):
+            self.target = target
+
+        async def run(self):
+            await self.sleep(3)
+            self.target.interrupt("stop")
+
+    env = Environment()
+    sleeper = Sleeper(env)
+    Interrupter(env, sleeper)
+    env.run(until=5)
+    assert sleeper.log_ == [(3, "stop"), 4]
+    assert (env.live_count, env.dead_count) == (0, 1)
+    env.run()
+    # The phantom entry at time 10 must not advance the clock.
+    assert env.now == 4
+    assert env.dead_count == 0
+
+
+def test_sleep_rejects_negative_delay():
+    """Test that Sleep raises ValueError for a negative delay."""
+    env = Environment()
+    with pytest.raises(ValueError, match="non-negative"):
+        env.sleep(-1)
+
+
+def test_sleep_is_not_an_event():
+    """Test that FirstOf rejects a Sleep (use Timeout there)."""
+    env = Environment()
+    with pytest.raises(TypeError, match="must be an Event"):
+        FirstOf(env, a=env.sleep(1))
+
+
+def test_sleep_rejects_second_waiter():
+    """Test that a Sleep awaited by two processes fails the second one."""
+    env = Environment()
+    shared = env.sleep(3)
+    woke = []
+
+    async def sleeper(name):
+        await shared
+        woke.append((env.now, name))
+
+    env.process(sleeper("first"))
+    env.process(sleeper("second"))
+    with pytest.raises(RuntimeError, match="one process"):
+        env.run()
+    env.run()
+    assert woke == [(3, "first")]
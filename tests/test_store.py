@@ -1,7 +1,15 @@
 """Test asimpy Store."""
 
 import pytest
-from asimpy import Environment, Process, Store, StoreEmpty, StoreFull
+from asimpy import (
+    Environment,
+    FirstOf,
+    KeyedStore,
+    Process,
+    Store,
+    StoreEmpty,
+    StoreFull,
+)
 from asimpy.event import Event
 
 
@@ -362,3 +370,216 @@ def test_store_sleep_wake_pattern():
     Waker(env, store)
     env.run()
     assert sleeper.message == "hello"
+
+
+def _sku(item):
+    return item[0]
+
+
+def test_keyed_store_get_by_key_is_fifo():
+    """get(key) returns the oldest item with that key."""
+    env = Environment()
+    store = KeyedStore(env, key=_sku)
+    for item in [("a", 1), ("b", 1), ("a", 2), ("b", 2)]:
+        store.try_put(item)
+    assert store.try_get("b") == ("b", 1)
+    assert store.try_get("a") == ("a", 1)
+    assert store.try_get("a") == ("a", 2)
+    assert len(store) == 1
+    with pytest.raises(StoreEmpty):
+        store.try_get("a")
+
+
+def test_keyed_store_get_any_key_in_arrival_order():
+    """get() with no key returns items in arrival order, skipping taken ones."""
+    env = Environment()
+    store = KeyedStore(env, key=_sku)
+    for item in [("a", 1), ("b", 1), ("a", 2), ("c", 1)]:
+        store.try_put(item)
+    assert store.try_get("a") == ("a", 1)
+    assert [store.try_get() for _ in range(3)] == [("b", 1), ("a", 2), ("c", 1)]
+    with pytest.raises(StoreEmpty):
+        store.try_get()
+
+
+def test_keyed_store_put_wakes_matching_getter():
+    """put() hands an item to the process waiting for its key, not to others."""
+    results = []
+
+    async def picker(env, store, sku):
+        item = await store.get(sku)
+        results.append((env.now, sku, item))
+
+    async def supplier(env, store):
+        await env.timeout(1)
+        await store.put(("b", 1))
+        await env.timeout(1)
+        await store.put(("a", 1))
+
+    env = Environment()
+    store = KeyedStore(env, key=_sku)
+    env.process(picker(env, store, "a"))
+    env.process(picker(env, store, "b"))
+    env.process(supplier(env, store))
+    env.run()
+    assert results == [(1, "b", ("b", 1)), (2, "a", ("a", 1))]
+
+
+def test_keyed_store_keyed_and_any_getters_share_fifo_order():
+    """A getter for any key that waited longer is served before a keyed one."""
+    results = []
+
+    async def picker(env, store, name, *key):
+        results.append((name, await store.get(*key)))
+
+    env = Environment()
+    store = KeyedStore(env, key=_sku)
+    env.process(picker(env, store, "any"))
+    env.process(picker(env, store, "keyed", "a"))
+    env.run()
+    store.put(("a", 1))
+    store.put(("a", 2))
+    env.run()
+    assert results == [("any", ("a", 1)), ("keyed", ("a", 2))]
+
+
+def test_keyed_store_skips_cancelled_getter():
+    """A cancelled getter does not receive an item."""
+    env = Environment()
+    store = KeyedStore(env, key=_sku)
+    first = store.get("a")
+    second = store.get("a")
+    first.cancel()
+    store.put(("a", 1))
+    assert first.cancelled
+    assert second.triggered
+    assert len(store) == 0
+
+
+def test_keyed_store_cancelled_getters_are_compacted():
+    """Gets abandoned by FirstOf timeouts do not pile up in the getter deques."""
+    env = Environment()
+    store = KeyedStore(env, key=_sku)
+
+    async def impatient():
+        for _ in range(1000):
+            await FirstOf(
+                env, keyed=store.get("a"), any=store.get(), late=env.timeout(1)
+            )
+
+    env.process(impatient())
+    env.run()
+    assert len(store._getters.get("a", ())) < 2 * KeyedStore._COMPACT_MIN
+    assert len(store._any_getters) < 2 * KeyedStore._COMPACT_MIN
+    first = store.get("a")
+    second = store.get()
+    store.put(("a", 1))
+    store.put(("b", 2))
+    assert first._value == ("a", 1)
+    assert second._value == ("b", 2)
+    assert not store._getters and not store._any_getters
+    assert not store._dead_getters and store._dead_any_getters == 0
+
+
+def test_keyed_store_cancelled_get_restores_item():
+    """Cancelling a pre-triggered get puts its item back."""
+    env = Environment()
+    store = KeyedStore(env, key=_sku)
+    store.try_put(("a", 1))
+    evt = store.get("a")
+    assert evt.triggered
+    evt.cancel()
+    assert store.try_get("a") == ("a", 1)
+
+
+def test_keyed_store_capacity_blocks_and_promotes_to_getter():
+    """A blocked put is admitted when space frees, straight to a waiting getter."""
+    results = []
+
+    async def producer(env, store):
+        await store.put(("a", 1))
+        await store.put(("b", 1))
+        results.append(("put b", env.now))
+
+    async def picker_b(env, store):
+        await env.timeout(1)
+        item = await store.get("b")
+        results.append(("b", env.now, item))
+
+    async def picker_a(env, store):
+        await env.timeout(2)
+        item = await store.get("a")
+        results.append(("a", env.now, item))
+
+    env = Environment()
+    store = KeyedStore(env, key=_sku, capacity=1)
+    env.process(producer(env, store))
+    env.process(picker_b(env, store))
+    env.process(picker_a(env, store))
+    env.run()
+    assert results == [("a", 2, ("a", 1)), ("b", 2, ("b", 1)), ("put b", 2)]
+    assert len(store) == 0
+    store.try_put(("c", 1))
+    with pytest.raises(StoreFull):
+        store.try_put(("c", 2))
+
+
+def test_keyed_store_compacts_arrival_order():
+    """Items taken by key do not accumulate in the arrival-order deque."""
+    env = Environment()
+    store = KeyedStore(env, key=_sku)
+    for i in range(1000):
+        store.try_put(("a", i))
+        store.try_get("a")
+    assert len(store._order) < 200
+
+
+def test_keyed_store_rejects_bad_capacity():
+    """KeyedStore validates its capacity."""
+    env = Environment()
+    with pytest.raises(ValueError):
+        KeyedStore(env, key=_sku, capacity=0)
+
+
+def test_store_cancelled_getters_are_skipped():
+    """Getters cancelled by FirstOf timeouts are skipped, and order is kept."""
+    env = Environment()
+    s = Store(env)
+    served = []
+
+    async def getter(name, patience):
+        if patience is None:
+            served.append((name, await s.get()))
+        else:
+            await FirstOf(env, got=s.get(), late=env.timeout(patience))
+
+    for i in range(100):
+        env.process(getter(i, None if i % 10 == 0 else 1))
+    env.run(until=2)
+    assert len(s._getters) - s._dead == 10
+    for item in "abc":
+        s.put(item)
+    env.run()
+    assert served == [(0, "a"), (10, "b"), (20, "c")]
+    assert len(s._getters) - s._dead == 7
+
+
+def test_store_getters_served_out_of_order_are_compacted():
+    """Getters matched behind the front are dropped once dead entries pile up."""
+    env = Environment()
+    s = Store(env)
+    got = {}
+
+    async def picker(n):
+        got[n] = await s.get(lambda item: item == n)
+
+    for n in range(200):
+        env.process(picker(n))
+    env.run()
+    for n in reversed(range(200)):
+        s.put(n)
+        assert len(s._getters) - s._dead == n
+        assert s._dead < max(Store._COMPACT_MIN, n + 1)
+    env.run()
+    assert got == {n: n for n in range(200)}
+    assert len(s._getters) == s._dead < Store._COMPACT_MIN
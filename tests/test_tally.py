@@ -0,0 +1,178 @@
+"""Test asimpy Tally and the waits= option of Resource."""
+
+import math
+import random
+import statistics
+
+import pytest
+from asimpy import Environment, FirstOf, Resource, Tally
+
+
+def test_tally_empty():
+    """An empty tally has no statistics."""
+    t = Tally()
+    assert t.count == 0
+    assert math.isnan(t.mean)
+    assert math.isnan(t.variance)
+    assert math.isnan(t.quantile(0.5))
+
+
+def test_tally_mean_and_variance_match_statistics():
+    """Streaming moments agree with the two-pass versions."""
+    rng = random.Random(1)
+    data = [rng.gauss(1e6, 3.0) for _ in range(5000)]
+    t = Tally()
+    for x in data:
+        t.add(x)
+    assert t.count == len(data)
+    assert t.mean == pytest.approx(statistics.fmean(data))
+    assert t.variance == pytest.approx(statistics.variance(data))
+    assert t.min == min(data)
+    assert t.max == max(data)
+
+
+@pytest.mark.parametrize("q", [0, 0.1, 0.5, 0.9, 0.99, 1])
+def test_tally_quantiles_within_relative_accuracy(q):
+    """Quantiles are within the relative accuracy of the exact order statistic."""
+    rng = random.Random(2)
+    data = sorted(rng.expovariate(1.0) for _ in range(10000))
+    t = Tally(accuracy=0.01)
+    for x in data:
+        t.add(x)
+    exact = data[math.floor(q * (len(data) - 1))]
+    assert t.quantile(q) == pytest.approx(exact, rel=0.01)
+
+
+def test_tally_handles_zero_and_negative_values():
+    """Zero and negative values are ordered correctly."""
+    t = Tally()
+    for x in [-4, -1, 0, 0, 2, 8]:
+        t.add(x)
+    assert t.quantile(0) == -4
+    assert t.quantile(0.2) == pytest.approx(-1, rel=0.01)
+    assert t.quantile(0.5) == 0
+    assert t.quantile(1) == 8
+
+
+def test_tally_memory_is_bounded():
+    """The sketch grows with the range of magnitudes, not the count."""
+    rng = random.Random(3)
+    t = Tally()
+    for _ in range(100000):
+        t.add(rng.uniform(1, 1000))
+    assert len(t._pos) < 400
+
+
+def test_tally_merge_equals_single_tally():
+    """Merging two tallies gives the same result as tallying everything."""
+    rng = random.Random(4)
+    data = [rng.lognormvariate(0, 1) for _ in range(2000)]
+    whole, left, right = Tally(), Tally(), Tally()
+    for i, x in enumerate(data):
+        whole.add(x)
+        (left if i % 3 else right).add(x)
+    left.merge(right)
+    assert left.count == whole.count
+    assert left.mean == pytest.approx(whole.mean)
+    assert left.variance == pytest.approx(whole.variance)
+    assert left.min == whole.min and left.max == whole.max
+    for q in (0.05, 0.5, 0.95):
+        assert left.quantile(q) == whole.quantile(q)
+
+
+def test_tally_rejects_bad_arguments():
+    """Accuracy, quantile and merge arguments are validated."""
+    with pytest.raises(ValueError):
+        Tally(accuracy=0)
+    with pytest.raises(ValueError):
+        Tally().quantile(1.5)
+    with pytest.raises(ValueError):
+        Tally(accuracy=0.01).merge(Tally(accuracy=0.02))
+
+
+def test_resource_waits_untallied_by_default():
+    """Resource does not tally waits unless asked to."""
+    assert Resource(Environment()).waits is None
+
+
+def test_resource_waits_records_acquire_to_grant():
+    """Each acquire contributes the time until its slot was granted."""
+    env = Environment()
+    server = Resource(env, capacity=1, waits=True)
+
+    async def customer(arrival, service):
+        await env.timeout(arrival)
+        async with server:
+            await env.timeout(service)
+
+    env.process(customer(0, 5))
+    env.process(customer(1, 2))
+    env.process(customer(2, 1))
+    env.run()
+    # Granted at 0, 5 and 7 after requesting at 0, 1 and 2.
+    assert server.waits.count == 3
+    assert server.waits.mean == pytest.approx((0 + 4 + 5) / 3)
+    assert server.waits.max == 5
+
+
+def test_resource_waits_skip_cancelled_requests():
+    """A request abandoned while waiting is not tallied."""
+    env = Environment()
+    server = Resource(env, capacity=1, waits=True)
+
+    async def holder():
+        async with server:
+            await env.timeout(10)
+
+    async def impatient():
+        await env.timeout(1)
+        await FirstOf(env, a=server.acquire(), b=env.timeout(2))
+
+    async def patient():
+        await env.timeout(2)
+        async with server:
+            pass
+
+    env.process(holder())
+    env.process(impatient())
+    env.process(patient())
+    env.run()
+    assert server.waits.count == 2
+    assert server.waits.max == 8
+
+
+def test_tally_discard_reverses_add():
+    """Discarding an observation restores the statistics without it."""
+    rng = random.Random(5)
+    data = [rng.uniform(1, 10) for _ in range(100)]
+    kept, t = Tally(), Tally()
+    for x in data:
+        kept.add(x)
+        t.add(x)
+    t.add(0)
+    t.add(50)
+    t._discard(0)
+    t._discard(50)
+    assert t.count == kept.count
+    assert t.mean == pytest.approx(kept.mean)
+    assert t.variance == pytest.approx(kept.variance)
+    assert t.min == pytest.approx(kept.min, rel=0.01)
+    assert t.max == pytest.approx(kept.max, rel=0.01)
+    assert t.quantile(0.5) == kept.quantile(0.5)
+    t2 = Tally()
+    t2.add(3)
+    t2._discard(3)
+    assert t2.count == 0 and t2.min == math.inf
+
+
+def test_resource_waits_skip_cancelled_immediate_grant():
+    """An immediate grant that FirstOf discards is not tallied."""
+    env = Environment()
+    server = Resource(env, capacity=1, waits=True)
+    evt = server.acquire()
+    assert server.waits.count == 1
+    evt.cancel()
+    assert server.count == 0
+    assert server.waits.count == 0
+    server.acquire()
+    assert server.waits.count == 1 and server.waits.max == 0
@@ -0,0 +1,106 @@
+"""Test asimpy function-based tasks."""
+
+import pytest
+from asimpy import Environment, Interrupt, Queue, Resource, Task
+
+
+def test_task_runs_bare_coroutine():
+    """Test that env.process() drives a plain coroutine to completion."""
+    log = []
+
+    async def worker(env, name, delay):
+        await env.timeout(delay)
+        log.append((env.now, name))
+        await env.sleep(delay)
+        log.append((env.now, name))
+
+    env = Environment()
+    task = env.process(worker(env, "a", 2))
+    env.process(worker(env, "b", 3))
+    assert isinstance(task, Task)
+    env.run()
+    assert log == [(2, "a"), (3, "b"), (4, "a"), (6, "b")]
+    assert task._done
+
+
+def test_task_has_no_instance_dict():
+    """Test that a Task is a compact slotted object."""
+
+    async def idle():
+        pass
+
+    env = Environment()
+    task = env.process(idle())
+    assert not hasattr(task, "__dict__")
+    with pytest.raises(AttributeError):
+        task.anything = 1
+    env.run()
+
+
+def test_task_tight_loop_on_pretriggered_events():
+    """Test that pre-triggered events resume a task without advancing time."""
+    results = []
+
+    async def consumer(env, q):
+        for _ in range(3):
+            results.append((env.now, await q.get()))
+
+    env = Environment()
+    q = Queue(env)
+    for i in range(3):
+        q.try_put(i)
+    env.process(consumer(env, q))
+    env.run()
+    assert results == [(0, 0), (0, 1), (0, 2)]
+
+
+def test_task_interrupt():
+    """Test that a task can be interrupted while waiting."""
+    log = []
+
+    async def sleeper(env):
+        try:
+            await env.timeout(10)
+        except Interrupt as exc:
+            log.append((env.now, exc.cause))
+
+    async def interrupter(env, target):
+        await env.sleep(2)
+        target.interrupt("wake")
+
+    env = Environment()
+    target = env.process(sleeper(env))
+    env.process(interrupter(env, target))
+    env.run()
+    assert log == [(2, "wake")]
+
+
+def test_task_shares_resource_with_processes():
+    """Test that tasks queue for a resource in FIFO order."""
+    order = []
+
+    async def customer(env, name, res):
+        async with res:
+            order.append((env.now, name))
+            await env.sleep(1)
+
+    env = Environment()
+    res = Resource(env)
+    for name in "abc":
+        env.process(customer(env, name, res))
+    env.run()
+    assert order == [(0, "a"), (1, "b"), (2, "c")]
+
+
+def test_task_exception_propagates():
+    """Test that an exception in a task propagates out of run()."""
+
+    async def broken(env):
+        await env.sleep(1)
+        raise ValueError("boom")
+
+    env = Environment()
+    task = env.process(broken(env))
+    with pytest.raises(ValueError, match="boom"):
+        env.run()
+    assert task._done
@@ -1,7 +1,17 @@
 """Test asimpy timeout."""
 
 import pytest
-from asimpy import Environment, Timeout
+from asimpy import (
+    ArrayHeapScheduler,
+    BucketScheduler,
+    CalendarScheduler,
+    Environment,
+    FirstOf,
+    HeapScheduler,
+    Process,
+    Queue,
+    Timeout,
+)
 
 
 def test_timeout_zero_delay():
@@ -53,3 +63,65 @@ def test_timeout_rejects_negative_delay():
     env = Environment()
     with pytest.raises(ValueError, match="non-negative"):
         Timeout(env, -1)
+
+
+def test_timeout_cancel_counts_dead_entry():
+    """Test that cancelling a pending timeout marks its entry dead."""
+    env = Environment()
+    t1 = Timeout(env, 5)
+    Timeout(env, 10)
+    assert (env.live_count, env.dead_count) == (2, 0)
+    t1.cancel()
+    t1.cancel()
+    assert (env.live_count, env.dead_count) == (1, 1)
+    env.run()
+    assert (env.live_count, env.dead_count) == (0, 0)
+    assert env.now == 10
+
+
+def test_timeout_cancel_after_trigger_is_not_dead():
+    """Test that cancelling an already-fired timeout does not count as dead."""
+    env = Environment()
+    t = Timeout(env, 1)
+    env.run()
+    t.cancel()
+    assert env.dead_count == 0
+
+
+@pytest.mark.parametrize(
+    "scheduler",
+    [HeapScheduler, ArrayHeapScheduler, CalendarScheduler, BucketScheduler],
+)
+def test_timeout_losers_are_compacted(scheduler):
+    """Test that timeouts losing FirstOf races do not accumulate forever."""
+
+    class Requester(Process):
+        def init(self, q, sizes):
+            self.q = q
+            self.sizes = sizes
+
+        async def run(self):
+            for i in range(1000):
+                self.q.try_put(i)
+                await FirstOf(
+                    self._env, reply=self.q.get(), expire=self.timeout(10_000)
+                )
+                self.sizes.append(len(self._env._scheduler))
+                await self.timeout(1)
+
+    env = Environment(scheduler=scheduler())
+    sizes = []
+    Requester(env, Queue(env), sizes)
+    env.run()
+    assert len(sizes) == 1000
+    # Without compaction every losing timeout would still be scheduled.
+    assert max(sizes) <= 200
+    assert env.dead_count == 0
+
+
+def test_timeout_compact_fraction_is_validated():
+    """Test that Environment rejects a compact_fraction outside (0, 1]."""
+    with pytest.raises(ValueError, match="compact_fraction"):
+        Environment(compact_fraction=0)
+    with pytest.raises(ValueError, match="compact_fraction"):
+        Environment(compact_fraction=1.5)